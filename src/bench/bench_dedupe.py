@@ -0,0 +1,113 @@
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from ..metrics import RunMetrics, add_metrics_arguments, instrumented
+from ..silver.compact import compact_records
+from ..silver.dedupe import dedupe_latest
+from .synthetic import synthetic_records
+
+
+def make_records(n: int, unique_ratio: float, seed: int) -> list[dict[str, Any]]:
+    """
+    Synthetic Bronze-shaped records for benchmarking (synthetic.py).
+    About `unique_ratio * n` distinct recordids, plus a few missing ids / invalid timestamps.
+    """
+    return list(synthetic_records(n, seed, duplicate_rate=1 - unique_ratio))
+
+
+def peak_memory(build: Callable[[], Any]) -> int:
+    """Peak bytes allocated (tracemalloc) while `build` runs and its result is alive."""
+    tracemalloc.start()
+    try:
+        result = build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def compare_memory(records: list[dict[str, Any]]) -> dict[str, float]:
+    """
+    Peak memory of holding the records as parsed dicts vs CompactRecords.
+    Both are built from JSON lines, as when reading Bronze, so no strings are shared up front.
+    """
+    lines = [json.dumps(r) for r in records]
+    n = len(lines)
+    dict_peak = peak_memory(lambda: [json.loads(line) for line in lines])
+    compact_peak = peak_memory(lambda: list(compact_records(json.loads(line) for line in lines)))
+    per_m = 1_000_000 / n / 2**20
+    print(f"  dicts: {dict_peak * per_m:,.0f} MiB per million records")
+    print(f"compact: {compact_peak * per_m:,.0f} MiB per million records")
+    print(f"Reduction: {1 - compact_peak / dict_peak:.0%}")
+    return {"dict_mib_per_million": round(dict_peak * per_m, 1), "compact_mib_per_million": round(compact_peak * per_m, 1)}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark dedupe_latest engines on synthetic records.")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Number of input records (default: 1000000).")
+    parser.add_argument("--unique-ratio", type=float, default=0.7, help="Distinct recordids / records (default: 0.7).")
+    parser.add_argument("--seed", type=int, default=311, help="Random seed (default: 311).")
+    parser.add_argument("--memory", action="store_true", help="Compare peak memory of dict vs CompactRecord records instead.")
+    add_metrics_arguments(parser)
+    return parser
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics | None = None) -> None:
+    """Time each engine (or, with --memory, compare memory); phases and timings are recorded in `metrics`."""
+    metrics = metrics or RunMetrics("bench_dedupe")
+    print(f"Generating {args.records} records...")
+    with metrics.phase("generate") as phase:
+        records = make_records(args.records, args.unique_ratio, args.seed)
+        phase["records"] = len(records)
+    if args.memory:
+        with metrics.phase("memory"):
+            metrics.add_stats("memory", compare_memory(records))
+        return
+
+    results = {}
+    for engine in ("python", "numpy"):
+        with metrics.phase(engine) as phase:
+            t0 = time.perf_counter()
+            deduped, stats = dedupe_latest(records, engine=engine)
+            elapsed = time.perf_counter() - t0
+            phase["records"] = args.records
+        results[engine] = (deduped, stats, elapsed)
+        print(f"{engine:>6}: {elapsed:.3f}s ({args.records / elapsed:,.0f} records/s), kept {stats['kept_records']}")
+
+    compact = list(compact_records(records))
+    with metrics.phase("compact") as phase:
+        t0 = time.perf_counter()
+        _, compact_stats = dedupe_latest(compact)
+        elapsed = time.perf_counter() - t0
+        phase["records"] = args.records
+    print(f"compact: {elapsed:.3f}s ({args.records / elapsed:,.0f} records/s) on pre-built CompactRecords, kept {compact_stats['kept_records']}")
+
+    py_deduped, py_stats, py_elapsed = results["python"]
+    np_deduped, np_stats, np_elapsed = results["numpy"]
+    same = py_stats == np_stats and len(py_deduped) == len(np_deduped) and all(
+        a is b for a, b in zip(py_deduped, np_deduped)
+    )
+    metrics.add_stats("dedupe", py_stats)
+    metrics.add_stats("engines", {
+        "seconds": {"python": round(py_elapsed, 4), "numpy": round(np_elapsed, 4), "compact": round(elapsed, 4)},
+        "speedup": round(py_elapsed / np_elapsed, 2),
+        "identical": same,
+    })
+    print("Identical output:", same)
+    print(f"Speedup (python / numpy): {py_elapsed / np_elapsed:.2f}x")
+    if not same:
+        raise SystemExit("Engines disagree")
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    with instrumented("bench_dedupe", args) as metrics:
+        run(args, metrics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from queue import Empty
+from typing import Any
+
+from ..gold.build_weekly_trends import aggregate_records
+from ..gold.columnar import COLUMNAR_SUFFIX, encode_table
+from ..gold.cube import (
+    DEFAULT_TABLES,
+    WEEK_COLUMN,
+    finest_grain,
+    parse_table,
+    rollup,
+    table_name,
+)
+from ..gold.publish import GoldPublisher, csv_bytes
+from ..gold.weeks import DEFAULT_TIMEZONE, local_days, transition_table
+from ..ingestion.bronze_io import find_bronze_files
+from ..ingestion.reader import DECODERS, JSON_DECODER, iter_records
+from ..metrics import (
+    RunMetrics,
+    add_metrics_arguments,
+    file_size,
+    instrumented,
+    peak_rss_mib,
+)
+from ..silver.compact import StringPool, compact_records
+from ..silver.dedupe import dedupe_latest
+from ..silver.partitions import write_week_partitions
+from .synthetic import SYNTHETIC_DIR, dataset_dir, write_bronze_files
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RESULTS_DIR = Path("data/bench")
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+# Stages faster than this (in the previous run) are compared but never count as a regression: too noisy
+NOISE_FLOOR_S = 0.05
+# Marker with the settings a dataset was generated with (not a .json name, so it is never read as Bronze)
+DONE_NAME = "_generated.txt"
+
+
+def ensure_dataset(n: int, files: int, seed: int, duplicate_rate: float) -> Path:
+    """Synthetic Bronze for one size, generated once and reused by later runs with the same settings."""
+    out_dir = dataset_dir(SYNTHETIC_DIR, n, seed, duplicate_rate)
+    done = out_dir / DONE_NAME
+    settings = {"records": n, "files": files, "seed": seed, "duplicate_rate": duplicate_rate}
+    if done.exists() and json.loads(done.read_text(encoding="utf-8")) == settings:
+        return out_dir
+    for stale in find_bronze_files(out_dir) if out_dir.exists() else []:
+        stale.unlink()
+    print(f"Generating {n} synthetic records in {out_dir} ...")
+    t0 = time.perf_counter()
+    write_bronze_files(out_dir, n, files, seed, duplicate_rate)
+    done.write_text(json.dumps(settings), encoding="utf-8")
+    print(f"Generated in {time.perf_counter() - t0:.1f}s")
+    return out_dir
+
+
+def measure_stages(bronze_dir: Path, tables: list[str], tz_name: str, engine: str, decoder: str) -> dict[str, Any]:
+    """
+    Run the pipeline's steps over one dataset, timing each on its own:
+    load (parse Bronze into CompactRecords), dedupe, bucket (open timestamps -> local days),
+    aggregate (finest-grain counts, stats and close-time sketches) and write (Silver week
+    partitions plus Gold CSV and .gcol tables, to a temporary directory).
+    """
+    files = find_bronze_files(bronze_dir)
+    table_dims = [parse_table(t) for t in tables]
+    grain = finest_grain(table_dims)
+    stages: list[dict[str, Any]] = []
+    state: dict[str, Any] = {}
+
+    def stage(name: str, n: int | None, step: Callable[[], Any]) -> Any:
+        """Time one step; `n` is its input record count, or None to use len() of its result."""
+        rss_before = peak_rss_mib()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        result = step()
+        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+        rss_after = peak_rss_mib()
+        n = len(result) if n is None else n
+        stages.append({
+            "stage": name,
+            "records": n,
+            "seconds": round(wall, 4),
+            "cpu_seconds": round(cpu, 4),
+            "records_per_s": round(n / wall) if wall > 0 else None,
+            "peak_rss_mib": rss_after,
+            "rss_growth_mib": None if rss_after is None else round(rss_after - rss_before, 1),
+        })
+        print(f"  {name:>9}: {wall:8.3f}s  {n / wall if wall > 0 else 0:>12,.0f} records/s  peak RSS {rss_after} MiB")
+        return result
+
+    def load() -> list:
+        pool = StringPool()
+        return [c for f in files for c in compact_records(iter_records(f, decoder=decoder), pool)]
+
+    def write() -> int:
+        with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+            out = Path(tmp)
+            write_week_partitions(state["deduped"], out / "silver")
+            (out / "gold").mkdir()
+            publisher = GoldPublisher(out / "gold", datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"))
+            for table in table_dims:
+                counts = rollup(state["agg"]["counts"], grain, table)
+                name = table_name(table)
+                body, rows = csv_bytes([WEEK_COLUMN, *table, "request_count"], ([*key, n] for key, n in sorted(counts.items())))
+                publisher.publish(name, "csv", ".csv", body, rows)
+                publisher.publish(name, "columnar", COLUMNAR_SUFFIX, encode_table(list(table), counts), len(counts))
+            publisher.commit()
+            return sum(p.stat().st_size for p in out.rglob("*") if p.is_file())
+
+    transition_table(tz_name)  # built once per process; kept out of the bucket timing
+    records = stage("load", None, load)
+    deduped, dedupe_stats = stage("dedupe", len(records), lambda: dedupe_latest(records, engine=engine))
+    state["deduped"] = deduped
+    records.clear()  # only the winners stay alive for the later stages
+    stage("bucket", len(deduped), lambda: local_days([c.open_us for c in deduped], tz_name))
+    state["agg"] = stage("aggregate", len(deduped), lambda: aggregate_records(deduped, grain, tz_name))
+    bytes_written = stage("write", len(deduped), write)
+    return {
+        "files": len(files),
+        "bronze_bytes": sum(f.stat().st_size for f in files),
+        "kept_records": dedupe_stats["kept_records"],
+        "bytes_written": bytes_written,
+        "stages": stages,
+    }
+
+
+def _measure_in_child(queue: Any, bronze_dir: Path, tables: list[str], tz_name: str, engine: str, decoder: str) -> None:
+    queue.put(measure_stages(bronze_dir, tables, tz_name, engine, decoder))
+
+
+def measure_isolated(bronze_dir: Path, tables: list[str], tz_name: str, engine: str, decoder: str) -> dict[str, Any]:
+    """measure_stages in a fresh process, so each size starts from a clean heap and its own peak RSS."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure_in_child, args=(queue, bronze_dir, tables, tz_name, engine, decoder))
+    proc.start()
+    try:
+        while True:
+            try:
+                result = queue.get(timeout=1)
+                break
+            except Empty:
+                # A child killed by the OOM killer never puts a result
+                if not proc.is_alive():
+                    raise SystemExit(f"Benchmark process for {bronze_dir} failed (exit code {proc.exitcode})") from None
+    except KeyboardInterrupt:
+        proc.terminate()
+        raise
+    proc.join()
+    return result
+
+
+def compare_runs(previous: dict[str, Any], current: dict[str, Any]) -> float:
+    """
+    Print seconds per stage and size against a previous results file; returns the worst slowdown ratio
+    among stages that took at least NOISE_FLOOR_S before.
+    """
+    before = {(run["records"], s["stage"]): s for run in previous["runs"] for s in run["stages"]}
+    worst = 0.0
+    print(f"\n---Compared with {previous['started_at']}---")
+    print(f"{'records':>10} {'stage':>9} {'before':>9} {'now':>9} {'ratio':>7} {'peak MiB':>17}")
+    for run in current["runs"]:
+        for s in run["stages"]:
+            old = before.get((run["records"], s["stage"]))
+            if old is None or not old["seconds"]:
+                continue
+            ratio = s["seconds"] / old["seconds"]
+            if old["seconds"] >= NOISE_FLOOR_S:
+                worst = max(worst, ratio)
+            print(
+                f"{run['records']:>10} {s['stage']:>9} {old['seconds']:>8.3f}s {s['seconds']:>8.3f}s {ratio:>6.2f}x "
+                f"{old['peak_rss_mib']!s:>8} -> {s['peak_rss_mib']!s:<8}"
+            )
+    return worst
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark load, dedupe, bucket, aggregate and write on synthetic Bronze at several sizes."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Record counts to run (default: 10000 1000000 10000000).")
+    parser.add_argument("--files", type=int, default=10, help="Bronze files per dataset (default: 10).")
+    parser.add_argument("--seed", type=int, default=311, help="Generator seed (default: 311).")
+    parser.add_argument("--duplicate-rate", type=float, default=0.3, help="Share of records repeating an earlier recordid (default: 0.3).")
+    parser.add_argument("--engine", choices=["python", "numpy"], default="python", help="Dedupe engine (default: python).")
+    parser.add_argument(
+        "--json-decoder",
+        choices=list(DECODERS),
+        default=JSON_DECODER,
+        help=f"JSON decoder for the load stage (default: the fastest installed, {JSON_DECODER}).",
+    )
+    parser.add_argument("--tables", nargs="+", default=DEFAULT_TABLES, help=f"Gold tables to build (default: {' '.join(DEFAULT_TABLES)}).")
+    parser.add_argument("--timezone", default=DEFAULT_TIMEZONE, help=f"Week time zone (default: {DEFAULT_TIMEZONE}).")
+    parser.add_argument("--out", type=Path, default=None, help=f"Results file (default: {RESULTS_DIR}/bench__<timestamp>.json).")
+    parser.add_argument("--compare", type=Path, default=None, help="A previous results file to compare against.")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=None,
+        help="With --compare: exit with an error if any stage took more than this many times as long (e.g. 1.25).",
+    )
+    add_metrics_arguments(parser)
+    return parser
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics | None = None) -> dict[str, Any]:
+    """
+    Generate (or reuse) a dataset per size and measure every stage on it. The stage timings go
+    to the results file; `metrics` gets one phase per size (generation plus measurement).
+    """
+    metrics = metrics or RunMetrics("run_bench")
+    previous = None
+    if args.compare is not None:
+        try:
+            previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            raise SystemExit(f"Cannot read results to compare with: {args.compare} ({e})") from e
+
+    started = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    results: dict[str, Any] = {
+        "started_at": started,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np is not None,
+        "settings": {
+            "seed": args.seed,
+            "duplicate_rate": args.duplicate_rate,
+            "files": args.files,
+            "engine": args.engine,
+            "json_decoder": args.json_decoder,
+            "tables": args.tables,
+            "timezone": args.timezone,
+        },
+        "runs": [],
+    }
+    for n in args.sizes:
+        with metrics.phase(f"{n}_records") as phase:
+            bronze_dir = ensure_dataset(n, args.files, args.seed, args.duplicate_rate)
+            print(f"\n{n} records ({args.engine} dedupe, {args.json_decoder} decoder):")
+            measured = measure_isolated(bronze_dir, args.tables, args.timezone, args.engine, args.json_decoder)
+            metrics.add_read(sum(file_size(f) for f in find_bronze_files(bronze_dir)))
+            phase["records"] = n
+        results["runs"].append({"records": n, **measured})
+
+    out_path = args.out or RESULTS_DIR / f"bench__{started}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    metrics.add_written(file_size(out_path))
+    print(f"\nResults: {out_path}")
+
+    if previous is not None:
+        worst = compare_runs(previous, results)
+        metrics.add_stats("compare", {"previous": previous["started_at"], "worst_slowdown": round(worst, 3)})
+        if args.max_slowdown is not None and worst > args.max_slowdown:
+            raise SystemExit(f"Slowest stage regressed {worst:.2f}x (limit {args.max_slowdown}x)")
+    return results
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    with instrumented("run_bench", args) as metrics:
+        run(args, metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import argparse
+import math
+import random
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from ..ingestion.bronze_io import (
+    COMPRESSION_SUFFIXES,
+    DEFAULT_COMPRESSION,
+    BronzeWriter,
+)
+
+DATASET_ID = "3-1-1-service-requests"
+SYNTHETIC_DIR = Path("data/bench/bronze")
+DEFAULT_START = date(2025, 1, 6)
+# Vancouver local time as a fixed UTC offset; close enough for generated open hours and close dates
+LOCAL_OFFSET_S = -8 * 3600
+POOL_SIZE = 100_000
+PAGE_SIZE = 10_000
+
+# Weights follow the relative frequencies seen in real pulls of the dataset
+LOCAL_AREAS = {
+    "Downtown": 181, "Kensington-Cedar Cottage": 151, "Sunset": 132, "Renfrew-Collingwood": 129,
+    "Grandview-Woodland": 118, "Kitsilano": 112, "Hastings-Sunrise": 104, "Mount Pleasant": 97,
+    "West End": 74, "Killarney": 74, "Fairview": 73, "Strathcona": 70, "Marpole": 68, "Riley Park": 63,
+    "Victoria-Fraserview": 61, "West Point Grey": 46, "Dunbar-Southlands": 41, "Arbutus Ridge": 34,
+    "Shaughnessy": 28, "Oakridge": 26, "South Cambie": 24, "Kerrisdale": 24,
+}
+MISSING_LOCAL_AREA = 0.16
+EMPTY_LOCAL_AREA = 0.005
+DEPARTMENTS = {
+    "ENG - Sanitation Services": (470, ["Garbage Bin Request Case", "Missed Garbage Bin Pickup Case", "Abandoned Non-Recyclables-Small Case", "Sanitation Operations Inquiry Case"]),
+    "DBL - Services Centre": (272, ["Building and Development Inquiry Case", "Tenant Improvement Program Request Case"]),
+    "DBL - Licence Office": (215, ["Business Licence Request Case"]),
+    "ENG - Streets Operations": (167, ["Street Surface Water Flooding Case", "Pothole Case", "Sidewalk Repair Case"]),
+    "DBL - Property Use Inspections": (138, ["Noise on Private Property Case", "Private Property Concern Case", "Graffiti Removal - Private Property Case"]),
+    "ENG - Traffic and Electrical Operations and Design": (127, ["Street Light Out Case", "Sign Repair Case", "Traffic Signal Repair Case"]),
+    "ENG - Parking Enforcement and Operations": (126, ["Parking Enforcement Request Case", "Abandoned or Uninsured Vehicle Case", "Parking Enforcement Transfer Case"]),
+    "311 Contact Centre": (110, ["City Services Feedback Case", "General Feedback Case", "Website Feedback Case"]),
+    "PR - Urban Forestry": (36, ["City and Park Trees Maintenance Case", "Rats and Rodents Case"]),
+    "CMO - Business and Election Services": (34, ["Mayor and Council Feedback Case"]),
+    "ENG - Development and Major Projects Branch": (32, ["Engineering Client Services Request Case"]),
+    "ENG - Waterworks Operations": (28, ["Water Leak Case", "Water Quality Concern Case", "Water Meter Reading Request Case"]),
+    "ENG - Integrated Graffiti Management": (26, ["Graffiti Removal - City Property Case", "Graffiti Removal - External Organization Case"]),
+    "DBL - Proactive Enforcement": (20, ["Short-Term Rental Concern Case", "Short-Term Rental Request Case"]),
+}
+CHANNELS = {"WEB": 976, "Phone": 686, "Mobile App": 340, "Chat": 15, "E-mail": 3}
+CLOSURE_REASONS = {
+    "Service provided": 631, "Assigned to inspector": 146, "Reviewed and no action planned": 71,
+    "Further action has been planned": 64, "Unknown": 60, "Issue not found or inaccessible": 48,
+    "Referred to another service group": 44,
+}
+# Local hour of the open timestamp: office hours dominate, nights are quiet
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 7, 10, 11, 11, 10, 10, 10, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+CLOSED_SHARE = 0.57
+# Days from open to close, and from open to last modification, are lognormal:
+# medians of ~3 and ~1 days with long tails (p90 ~21 and ~20 days in real pulls)
+CLOSE_DAYS_MU, CLOSE_DAYS_SIGMA = math.log(3), 1.5
+LAG_HOURS_MU, LAG_HOURS_SIGMA = math.log(24), 1.9
+SAME_MOMENT_SHARE = 0.25
+MAX_LAG_S = 180 * 86400
+
+
+def _choices(weights: dict[str, int]) -> tuple[list[str], list[int]]:
+    names = list(weights)
+    cum, total = [], 0
+    for name in names:
+        total += weights[name]
+        cum.append(total)
+    return names, cum
+
+
+def _iso(epoch_s: float) -> str:
+    return datetime.fromtimestamp(int(epoch_s), timezone.utc).isoformat()
+
+
+def _local_date(epoch_s: float) -> str:
+    return datetime.fromtimestamp(int(epoch_s) + LOCAL_OFFSET_S, timezone.utc).date().isoformat()
+
+
+class SyntheticBronze:
+    """
+    Deterministic stream of records shaped like the ODS API's (datasetid, recordid, fields,
+    geometry, record_timestamp), for benchmarks at any size.
+
+    New requests open in time order across `days` days from `start`, at office-hour-weighted
+    local times, with local_area / department / request type / channel drawn from the real
+    frequencies. A `duplicate_rate` share of the stream repeats an earlier recordid: half are
+    exact re-pulls (same last-modified), half are later versions (some closing the request).
+    Last-modified lags the open timestamp by a lognormal delay, so records arrive out of
+    open-time order as they do from the API. An `invalid_rate` share gets an empty recordid,
+    an unparsable last-modified or no open timestamp.
+
+    The same arguments always produce the same records.
+    """
+
+    def __init__(
+        self,
+        seed: int = 311,
+        duplicate_rate: float = 0.3,
+        start: date = DEFAULT_START,
+        days: int = 365,
+        invalid_rate: float = 0.001,
+    ) -> None:
+        if not 0 <= duplicate_rate < 1:
+            raise SystemExit("--duplicate-rate must be in [0, 1)")
+        self.rng = random.Random(seed)
+        self.duplicate_rate = duplicate_rate
+        self.start_s = datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp() - LOCAL_OFFSET_S
+        self.days = days
+        self.invalid_rate = invalid_rate
+        self.areas = _choices(LOCAL_AREAS)
+        self.departments = _choices({name: weight for name, (weight, _) in DEPARTMENTS.items()})
+        self.channels = _choices(CHANNELS)
+        self.reasons = _choices(CLOSURE_REASONS)
+        self.hours = _choices({str(h): w for h, w in enumerate(HOUR_WEIGHTS)})
+        # Earlier requests that may be pulled again: [record, open_s, last_modified_s]
+        self.pool: list[list[Any]] = []
+
+    def _pick(self, choices: tuple[list[str], list[int]]) -> str:
+        names, cum = choices
+        return self.rng.choices(names, cum_weights=cum)[0]
+
+    def _close(self, fields: dict[str, Any], open_s: float, last_s: float) -> float:
+        """Close the request; returns its last-modified (the close moment, if later)."""
+        days = min(int(self.rng.lognormvariate(CLOSE_DAYS_MU, CLOSE_DAYS_SIGMA)), 365)
+        close_s = open_s + days * 86400 + self.rng.randrange(3600)
+        fields["status"] = "Close"
+        fields["closure_reason"] = self._pick(self.reasons)
+        fields["service_request_close_date"] = _local_date(close_s)
+        return max(last_s, close_s)
+
+    def _new(self, progress: float) -> tuple[dict[str, Any], float, float]:
+        rng = self.rng
+        day = min(int(progress * self.days), self.days - 1)
+        open_s = self.start_s + day * 86400 + int(self._pick(self.hours)) * 3600 + rng.randrange(3600)
+        department = self._pick(self.departments)
+        fields: dict[str, Any] = {
+            "channel": self._pick(self.channels),
+            "department": department,
+            "status": "Open",
+            "closure_reason": "N/A",
+        }
+        roll = rng.random()
+        if roll >= MISSING_LOCAL_AREA:
+            lat = round(rng.uniform(49.20, 49.31), 10)
+            lon = round(rng.uniform(-123.23, -123.02), 11)
+            fields.update(latitude=lat, longitude=lon, address=f"{rng.randrange(100, 9999)} {rng.choice('EW')} {rng.randrange(1, 70)}TH AV")
+            fields["local_area"] = "" if roll < MISSING_LOCAL_AREA + EMPTY_LOCAL_AREA else self._pick(self.areas)
+        fields["service_request_type"] = rng.choice(DEPARTMENTS[department][1])
+        if rng.random() < SAME_MOMENT_SHARE:
+            last_s = open_s + rng.randrange(600)
+        else:
+            last_s = open_s + min(rng.lognormvariate(LAG_HOURS_MU, LAG_HOURS_SIGMA) * 3600, MAX_LAG_S)
+        if rng.random() < CLOSED_SHARE:
+            last_s = self._close(fields, open_s, last_s)
+        fields["last_modified_timestamp"] = _iso(last_s)
+        fields["service_request_open_timestamp"] = _iso(open_s)
+        record: dict[str, Any] = {"datasetid": DATASET_ID, "recordid": f"{rng.getrandbits(160):040x}", "fields": fields}
+        if "latitude" in fields:
+            fields["geom"] = [fields["latitude"], fields["longitude"]]
+            record["geometry"] = {"type": "Point", "coordinates": [fields["longitude"], fields["latitude"]]}
+        return record, open_s, last_s
+
+    def _repeat(self) -> dict[str, Any]:
+        rng = self.rng
+        entry = self.pool[rng.randrange(len(self.pool))]
+        record, open_s, last_s = entry
+        if rng.random() < 0.5:
+            return record  # re-pulled unchanged, e.g. by an overlapping lookback window
+        fields = dict(record["fields"])
+        last_s += rng.lognormvariate(LAG_HOURS_MU, LAG_HOURS_SIGMA) * 3600
+        if fields["status"] == "Open" and rng.random() < 0.5:
+            last_s = self._close(fields, open_s, last_s)
+        fields["last_modified_timestamp"] = _iso(last_s)
+        record = {**record, "fields": fields}
+        entry[0], entry[2] = record, last_s
+        return record
+
+    def _stamp(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Set record_timestamp (when the API served it) and inject the occasional invalid record."""
+        rng = self.rng
+        served = datetime.fromisoformat(record["fields"]["last_modified_timestamp"]) + timedelta(seconds=rng.randrange(7200))
+        record = {**record, "record_timestamp": served.strftime("%Y-%m-%dT%H:%M:%S.") + f"{rng.randrange(1000):03d}Z"}
+        if self.invalid_rate and rng.random() < self.invalid_rate:
+            fields = dict(record["fields"])
+            kind = rng.randrange(3)
+            if kind == 0:
+                record["recordid"] = ""
+            elif kind == 1:
+                fields["last_modified_timestamp"] = "not-a-timestamp"
+            else:
+                fields.pop("service_request_open_timestamp")
+            record["fields"] = fields
+        return record
+
+    def records(self, n: int) -> Iterator[dict[str, Any]]:
+        """`n` records in pull order."""
+        rng = self.rng
+        for i in range(n):
+            if self.pool and rng.random() < self.duplicate_rate:
+                yield self._stamp(self._repeat())
+                continue
+            record, open_s, last_s = self._new(i / n)
+            if len(self.pool) < POOL_SIZE:
+                self.pool.append([record, open_s, last_s])
+            else:
+                self.pool[rng.randrange(POOL_SIZE)] = [record, open_s, last_s]
+            yield self._stamp(record)
+
+
+def synthetic_records(n: int, seed: int = 311, duplicate_rate: float = 0.3, **options: Any) -> Iterator[dict[str, Any]]:
+    """Shorthand for SyntheticBronze(seed, duplicate_rate, **options).records(n)."""
+    return SyntheticBronze(seed, duplicate_rate, **options).records(n)
+
+
+def dataset_dir(base_dir: Path, n: int, seed: int, duplicate_rate: float) -> Path:
+    return base_dir / f"records={n}__seed={seed}__dup={duplicate_rate:g}"
+
+
+def write_bronze_files(
+    out_dir: Path,
+    n: int,
+    files: int = 1,
+    seed: int = 311,
+    duplicate_rate: float = 0.3,
+    compression: str = DEFAULT_COMPRESSION,
+    **options: Any,
+) -> list[Path]:
+    """
+    Write `n` synthetic records as `files` consecutive Bronze NDJSON files (as if from
+    successive pulls), named so that file order is pull order. Returns the file paths.
+    """
+    if files < 1:
+        raise SystemExit("--files must be >= 1")
+    stream = SyntheticBronze(seed, duplicate_rate, **options).records(n)
+    suffix = ".ndjson" + COMPRESSION_SUFFIXES[compression]
+    paths = []
+    for i in range(files):
+        size = n // files + (1 if i < n % files else 0)
+        path = out_dir / f"{DATASET_ID}__synthetic__{i:05d}{suffix}"
+        with BronzeWriter(path) as writer:
+            for offset in range(0, size, PAGE_SIZE):
+                writer.write_records([next(stream) for _ in range(min(PAGE_SIZE, size - offset))])
+        paths.append(path)
+    return paths
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Write deterministic synthetic Bronze files shaped like real ODS pulls.")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Number of records in total (default: 1000000).")
+    parser.add_argument("--files", type=int, default=1, help="Split the records over N consecutive files (default: 1).")
+    parser.add_argument("--seed", type=int, default=311, help="Random seed (default: 311).")
+    parser.add_argument("--duplicate-rate", type=float, default=0.3, help="Share of records repeating an earlier recordid (default: 0.3).")
+    parser.add_argument("--days", type=int, default=365, help="Days of open timestamps, starting 2025-01-06 (default: 365).")
+    parser.add_argument("--invalid-rate", type=float, default=0.001, help="Share of records with a missing id or bad timestamp (default: 0.001).")
+    parser.add_argument("--compression", choices=sorted(COMPRESSION_SUFFIXES), default=DEFAULT_COMPRESSION, help=f"Compression of the files (default: {DEFAULT_COMPRESSION}).")
+    parser.add_argument("--out-dir", type=Path, default=None, help=f"Output directory (default: {SYNTHETIC_DIR}/records=<n>__seed=<seed>__dup=<rate>).")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    out_dir = args.out_dir or dataset_dir(SYNTHETIC_DIR, args.records, args.seed, args.duplicate_rate)
+    paths = write_bronze_files(
+        out_dir, args.records, args.files, args.seed, args.duplicate_rate, args.compression,
+        days=args.days, invalid_rate=args.invalid_rate,
+    )
+    total = sum(p.stat().st_size for p in paths)
+    print(f"Wrote {args.records} records to {len(paths)} file(s) in {out_dir} ({total / 2**20:,.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
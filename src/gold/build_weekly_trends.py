@@ -1,10 +1,51 @@
+import argparse
+import gzip
+import hashlib
 import json
-from datetime import datetime, timezone, timedelta
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
 from pathlib import Path
-from operator import itemgetter
-import csv
 
-DT_MIN = datetime.min.replace(tzinfo=timezone.utc)
+from ..ingestion.reader import read_records
+from ..metrics import RunMetrics, add_metrics_arguments, file_size, instrumented
+from ..silver.compact import COMPACT_FIELDS, CompactRecord, StringPool, compact_batch
+from ..silver.dedupe_latest_by_recordid import MANIFEST_PATH, WEEKLY_DIR, load_manifest
+from ..silver.partitions import INDEX_NAME, load_index
+from .close_times import (
+    CLOSE_SKETCH_K,
+    DEFAULT_CLOSE_TABLES,
+    QUANTILE_COLUMNS,
+    add_close_time,
+    close_table_name,
+    close_time_rows,
+    days_to_close,
+    merge_sketches,
+    rollup_sketches,
+)
+from .columnar import COLUMNAR_SUFFIX, encode_table
+from .cube import (
+    DEFAULT_TABLES,
+    DIMENSIONS,
+    WEEK_COLUMN,
+    finest_grain,
+    parse_table,
+    rollup,
+    table_name,
+)
+from .publish import MANIFEST_NAME, GoldPublisher, csv_bytes
+from .quantiles import KLLSketch
+from .rolling import (
+    DEFAULT_TREND_SERIES,
+    TREND_COLUMNS,
+    compute_trends,
+    load_trend_state,
+    save_trend_state,
+    trend_name,
+)
+from .weeks import DEFAULT_TIMEZONE, local_days, week_of_day
+
+GOLD_STATE_NAME = "_gold_state.json.gz"
+TREND_STATE_NAME = "_trend_state.json"
 
 
 def get_latest_silver_file(silver_dir: str | Path) -> str | None:
@@ -25,201 +66,565 @@ def get_latest_silver_file(silver_dir: str | Path) -> str | None:
     # Since filenames are ISO formatted, alphabetical max == chronological latest.
     return max(files)
 
-def load_records(path: Path) -> list[dict]:
-    """Load records from a Silver file, supporting both shapes:
-    1) list of records
-    2) dict with a 'records' key
-    """
-    payload = json.loads(path.read_text(encoding="utf-8"))
-    if isinstance(payload, list):
-        return payload
-    return payload.get("records", [])
-
-def _to_dt(s: str | None) -> datetime:
-    """Parse ISO timestamp; return DT_MIN if missing/invalid."""
-    if not s:
-        return DT_MIN
-    if s.endswith("Z"):
-        s = s.replace("Z", "+00:00")
-    try:
-        return datetime.fromisoformat(s)
-    except ValueError:
-        return DT_MIN
-    
-def get_field(field_name: str, fields: dict) -> dict[str, str | bool]:
-    if field_name in fields:
-        value = fields.get(field_name)
-        if value and value.strip() != "":
-            return {"value": value.strip(), "missing_key": False, "empty_value": False}
-        else:
-            return {"value": "UNKNOWN", "missing_key": False, "empty_value": True}
-    else:
-        return {"value": "UNKNOWN", "missing_key": True, "empty_value": False}
 
-def main() -> None:
-    silver_dir = Path("data/silver")    
-    path = get_latest_silver_file(silver_dir)
+def current_silver(silver_file: str | Path | None = None) -> Path | None:
+    """
+    The Silver snapshot Gold reads: `silver_file` when given, else the one the Silver manifest
+    records for the last run (the weekly _index.json or a timestamped file, depending on --layout).
+    Without a manifest: the weekly index if there is one, else the newest timestamped file.
+    """
+    if silver_file:
+        return Path(silver_file)
+    recorded = load_manifest(MANIFEST_PATH)["silver_file"]
+    if recorded and Path(recorded).exists():
+        return Path(recorded)
+    if (WEEKLY_DIR / INDEX_NAME).exists():
+        return WEEKLY_DIR / INDEX_NAME
+    latest = get_latest_silver_file(MANIFEST_PATH.parent)
+    return Path(latest) if latest else None
+
+def load_records(path: Path, fields: Iterable[str] | None = None) -> Iterator[dict]:
+    """
+    Stream records from a Silver file one at a time, whatever its format (see reader.iter_records).
+    With `fields`, only the recordid and those keys of "fields" are kept.
+    """
+    return read_records(Path(path), "Silver", fields)
+
+COUNT_STATS = [
+    "input_records",
+    "produced_rows",
+    "invalid_or_missing_ts",
+    "unknown_local_area_count",
+    "unknown_department_count",
+    "unknown_any_count",
+    "unknown_both_count",
+    "missing_fields_local_area",
+    "missing_fields_department",
+    "empty_local_area_value",
+    "empty_department_value",
+    "closed_records",
+    "close_before_open",
+]
+# One bit per stat: a record's effect on the stats is a single int that can be added or subtracted exactly
+STAT_BITS = {name: 1 << i for i, name in enumerate(COUNT_STATS)}
+# sample name -> the stat whose records it shows
+SAMPLE_STATS = {
+    "missing_local_area_key": "missing_fields_local_area",
+    "missing_department_key": "missing_fields_department",
+    "empty_local_area_value": "empty_local_area_value",
+    "empty_department_value": "empty_department_value",
+}
+SAMPLE_MASK = sum(STAT_BITS[stat] for stat in SAMPLE_STATS.values())
+# Records per week-bucketing batch
+BUCKET_BATCH = 8192
+
+
+def as_record(r: dict | CompactRecord) -> dict:
+    return r if isinstance(r, dict) else r.to_record()
+
+
+def bucketed(
+    records: Iterable[dict | CompactRecord],
+    tz_name: str,
+    pool: StringPool,
+) -> Iterator[tuple[dict | CompactRecord, CompactRecord, int | None]]:
+    """
+    Stream (record, CompactRecord, local open day) triples, a batch at a time: dict records'
+    timestamp columns are parsed in bulk (compact_batch) and open timestamps converted to
+    local days with weeks.local_days, with no datetime per record.
+    """
+    batch: list[dict | CompactRecord] = []
+
+    def flush() -> Iterator[tuple[dict | CompactRecord, CompactRecord, int | None]]:
+        converted = iter(compact_batch([r for r in batch if not isinstance(r, CompactRecord)], pool, keep_payload=False))
+        compact = [r if isinstance(r, CompactRecord) else next(converted) for r in batch]
+        days = local_days([c.open_us for c in compact], tz_name)
+        yield from zip(batch, compact, days)
+
+    for r in records:
+        batch.append(r)
+        if len(batch) >= BUCKET_BATCH:
+            yield from flush()
+            batch = []
+    if batch:
+        yield from flush()
+
+
+def record_contribution(c: CompactRecord, open_day: int | None, grain: tuple[str, ...]) -> tuple[tuple[str, ...] | None, int]:
+    """
+    What one record adds to Gold: its finest-grain key (week_start_date, *grain), or None
+    when the open timestamp is missing/invalid (open_day is None), and the stats it
+    increments as STAT_BITS flags.
+    """
+    if open_day is None:
+        return None, STAT_BITS["input_records"] | STAT_BITS["invalid_or_missing_ts"]
+    flags = STAT_BITS["input_records"] | STAT_BITS["produced_rows"]
+    if c.close_day is not None:
+        flags |= STAT_BITS["closed_records"] if c.close_day >= open_day else STAT_BITS["close_before_open"]
+
+    # Categorical fields are stripped and pooled: None = key missing, "" = empty value
+    local_area = c.local_area or "UNKNOWN"
+    if local_area == "UNKNOWN":
+        flags |= STAT_BITS["unknown_local_area_count"]
+        if c.local_area is None:
+            flags |= STAT_BITS["missing_fields_local_area"]
+        elif c.local_area == "":
+            flags |= STAT_BITS["empty_local_area_value"]
+
+    department = c.department or "UNKNOWN"
+    if department == "UNKNOWN":
+        flags |= STAT_BITS["unknown_department_count"]
+        if c.department is None:
+            flags |= STAT_BITS["missing_fields_department"]
+        elif c.department == "":
+            flags |= STAT_BITS["empty_department_value"]
+
+    if department == "UNKNOWN" or local_area == "UNKNOWN":
+        flags |= STAT_BITS["unknown_any_count"]
+    if department == "UNKNOWN" and local_area == "UNKNOWN":
+        flags |= STAT_BITS["unknown_both_count"]
+
+    return (week_of_day(open_day), *[getattr(c, d) or "UNKNOWN" for d in grain]), flags
+
+
+def apply_flags(stats: dict, flags: int, times: int = 1) -> None:
+    """Add (or, with a negative `times`, subtract) a record's stat flags."""
+    for name, bit in STAT_BITS.items():
+        if flags & bit:
+            stats[name] += times
+
+
+def week_range(counts: dict[tuple[str, ...], int]) -> dict[str, str]:
+    weeks = {key[0] for key in counts}
+    return {"min_week_start_date": min(weeks, default=""), "max_week_start_date": max(weeks, default="")}
+
+
+def aggregate_records(
+    records: Iterable[dict | CompactRecord],
+    grain: tuple[str, ...],
+    tz_name: str = DEFAULT_TIMEZONE,
+) -> dict:
+    """
+    Aggregate Silver records (dicts or CompactRecords) in one pass, counting only at
+    the finest grain (week_start_date, *grain). Weeks start on Monday in `tz_name`.
+    Coarser tables are derived with cube.rollup. Time to close goes into one quantile
+    sketch per finest-grain key.
+
+    Returns {"stats": {...}, "samples": {...}, "grain": grain, "counts": {(week, *values): n},
+    "close_sketches": {(week, *values): KLLSketch}}.
+    """
+    stats = {key: 0 for key in COUNT_STATS}
+    counts: dict[tuple[str, ...], int] = {}
+    close_sketches: dict[tuple[str, ...], KLLSketch] = {}
+    samples: dict[str, dict] = {key: {} for key in SAMPLE_STATS}
+    # Records with the same flags are tallied together and expanded into stats once at the end
+    flag_counts: dict[int, int] = {}
+
+    for r, c, open_day in bucketed(records, tz_name, StringPool()):
+        key, flags = record_contribution(c, open_day, grain)
+        flag_counts[flags] = flag_counts.get(flags, 0) + 1
+        if key is not None:
+            counts[key] = counts.get(key, 0) + 1
+            days = days_to_close(c, open_day)
+            if days is not None:
+                add_close_time(close_sketches, key, days)
+        if flags & SAMPLE_MASK:
+            for sample_key, stat in SAMPLE_STATS.items():
+                if flags & STAT_BITS[stat] and not samples[sample_key]:
+                    samples[sample_key] = as_record(r)
+
+    for flags, n in flag_counts.items():
+        apply_flags(stats, flags, n)
+    stats.update(week_range(counts))
+    return {"stats": stats, "samples": samples, "grain": grain, "counts": counts, "close_sketches": close_sketches}
+
+
+class GoldState:
+    """
+    Gold aggregates kept up to date by deltas across runs.
+
+    Holds the finest-grain counts and stats, plus for every recordid the Silver week
+    partition it was read from, its stat flags and the key it was counted under.
+    An update re-reads only the partitions whose content hash changed. A record whose
+    contribution differs from the stored one has the old one subtracted and the new one
+    added; records that are gone from a changed (or removed) partition are subtracted.
+    Counts and stats therefore match a full recompute exactly.
+
+    Quantile sketches cannot subtract, so time-to-close sketches are kept per partition:
+    a changed partition's sketches are rebuilt from the records it is re-read for anyway,
+    and the tables merge the sketches of all partitions.
+
+    Persisted as gzip-compressed JSON, tagged with a fingerprint of the settings that
+    decide a record's key (grain and time zone); a state built with other settings is ignored.
+    """
+
+    def __init__(self, grain: tuple[str, ...], tz_name: str = DEFAULT_TIMEZONE) -> None:
+        self.grain = grain
+        self.tz_name = tz_name
+        config = {"grain": list(grain), "timezone": tz_name, "close_sketch_k": CLOSE_SKETCH_K}
+        self.fingerprint = hashlib.blake2b(json.dumps(config, sort_keys=True).encode("utf-8"), digest_size=8).hexdigest()
+        self.partitions: dict[str, str] = {}
+        self.counts: dict[tuple[str, ...], int] = {}
+        self.stats = {key: 0 for key in COUNT_STATS}
+        self.samples: dict[str, dict] = {key: {} for key in SAMPLE_STATS}
+        self.records: dict[str, tuple[str, int, tuple[str, ...] | None]] = {}
+        self.close_sketches: dict[str, dict[tuple[str, ...], KLLSketch]] = {}
+
+    @classmethod
+    def load(cls, path: Path, grain: tuple[str, ...], tz_name: str = DEFAULT_TIMEZONE) -> "GoldState":
+        state = cls(grain, tz_name)
+        if not path.exists():
+            return state
+        try:
+            data = json.loads(gzip.decompress(path.read_bytes()))
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"Gold state is corrupt: {path} (use --full to rebuild it)") from e
+        if data.get("config_fingerprint") != state.fingerprint:
+            print("Gold settings (tables or time zone) or state format changed since the last run; rebuilding the Gold state.")
+            return state
+        state.partitions = data["partitions"]
+        state.stats = data["stats"]
+        state.samples = data["samples"]
+        state.counts = {tuple(row[:-1]): row[-1] for row in data["counts"]}
+        # [recordid, partition, flags, *key]; no key when the record is not counted
+        state.records = {row[0]: (row[1], row[2], tuple(row[3:]) or None) for row in data["records"]}
+        # partition -> [[*key, sketch], ...]
+        state.close_sketches = {
+            part: {tuple(row[:-1]): KLLSketch.from_json(row[-1]) for row in rows}
+            for part, rows in data["close_sketches"].items()
+        }
+        return state
+
+    def save(self, path: Path) -> None:
+        data = {
+            "config_fingerprint": self.fingerprint,
+            "grain": list(self.grain),
+            "timezone": self.tz_name,
+            "partitions": self.partitions,
+            "stats": self.stats,
+            "samples": self.samples,
+            "counts": [[*key, n] for key, n in self.counts.items()],
+            "records": [[rid, part, flags, *(key or ())] for rid, (part, flags, key) in self.records.items()],
+            "close_sketches": {
+                part: [[*key, sketch.to_json()] for key, sketch in sketches.items()]
+                for part, sketches in self.close_sketches.items()
+            },
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(gzip.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), compresslevel=6))
+        tmp_path.replace(path)
+
+    def _apply(self, entry: tuple[str, int, tuple[str, ...] | None], sign: int) -> None:
+        _, flags, key = entry
+        apply_flags(self.stats, flags, sign)
+        if key is not None:
+            n = self.counts.get(key, 0) + sign
+            if n:
+                self.counts[key] = n
+            else:
+                del self.counts[key]
+
+    def update(
+        self,
+        index_path: Path,
+        partition_records: dict[str, list[CompactRecord]] | None = None,
+    ) -> dict[str, int]:
+        """
+        Bring the state in line with a week-partitioned Silver snapshot; returns what was touched.
+        Changed partitions found in `partition_records` (Silver's records, still in memory
+        when run in-process) are not re-read from disk.
+        """
+        partition_records = partition_records or {}
+        index = load_index(index_path)
+        current = {week: entry["sha256"] for week, entry in index["partitions"].items()}
+        changed = sorted(week for week, sha in current.items() if self.partitions.get(week) != sha)
+        touched = set(changed) | {week for week in self.partitions if week not in current}
+        summary = {
+            "partitions": len(current),
+            "reaggregated": len(changed),
+            "reused": len(current) - len(changed),
+            "records_changed": 0,
+            "records_removed": 0,
+            "partitions_removed": len(touched) - len(changed),
+            "records_read": 0,
+            "bytes_read": 0,
+        }
+
+        seen: set[str] = set()
+        pool = StringPool()
+        for week in changed:
+            records = partition_records.get(week)
+            if not records:
+                part_path = index_path.parent / index["partitions"][week]["file"]
+                summary["bytes_read"] += file_size(part_path)
+                # Only what CompactRecord reads; samples are re-read whole (_refresh_samples)
+                records = load_records(part_path, COMPACT_FIELDS)
+            sketches: dict[tuple[str, ...], KLLSketch] = {}
+            self.close_sketches[week] = sketches
+            for _, c, open_day in bucketed(records, self.tz_name, pool):
+                summary["records_read"] += 1
+                key, flags = record_contribution(c, open_day, self.grain)
+                entry = (week, flags, key)
+                seen.add(c.recordid)
+                days = days_to_close(c, open_day) if key is not None else None
+                if days is not None:
+                    add_close_time(sketches, key, days)
+                prev = self.records.get(c.recordid)
+                if prev == entry:
+                    continue
+                if prev is not None:
+                    self._apply(prev, -1)
+                self._apply(entry, 1)
+                self.records[c.recordid] = entry
+                summary["records_changed"] += 1
+
+        gone = [rid for rid, (week, _, _) in self.records.items() if week in touched and rid not in seen]
+        for rid in gone:
+            self._apply(self.records.pop(rid), -1)
+        summary["records_removed"] = len(gone)
+        for week in touched - set(current):
+            self.close_sketches.pop(week, None)
+        self.partitions = current
+        self._refresh_samples(index_path, index)
+        return summary
+
+    def _refresh_samples(self, index_path: Path, index: dict) -> None:
+        """Drop samples whose record no longer has that problem; find another example if one exists."""
+        for sample_key, stat in SAMPLE_STATS.items():
+            bit = STAT_BITS[stat]
+            sample = self.samples[sample_key]
+            held = self.records.get(sample.get("recordid")) if sample else None
+            if held is not None and held[1] & bit:
+                continue
+            self.samples[sample_key] = {}
+            if not self.stats[stat]:
+                continue
+            rid = min(rid for rid, (_, flags, _) in self.records.items() if flags & bit)
+            week = self.records[rid][0]
+            for r in load_records(index_path.parent / index["partitions"][week]["file"]):
+                if r.get("recordid") == rid:
+                    self.samples[sample_key] = r
+                    break
+
+    def to_aggregate(self) -> dict:
+        stats = {**self.stats, **week_range(self.counts)}
+        close_sketches: dict[tuple[str, ...], KLLSketch] = {}
+        for week in sorted(self.close_sketches):
+            merge_sketches(close_sketches, self.close_sketches[week])
+        return {
+            "stats": stats,
+            "samples": self.samples,
+            "grain": self.grain,
+            "counts": dict(self.counts),
+            "close_sketches": close_sketches,
+        }
+
 
-    if not path:
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build Gold weekly trend CSVs from Silver.")
+    parser.add_argument(
+        "--silver-file",
+        type=Path,
+        default=None,
+        help="Read this Silver file (or week partition _index.json) instead of the snapshot the Silver manifest records.",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild the Gold state from every Silver week partition instead of applying deltas.",
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        default=DEFAULT_TABLES,
+        help=(
+            "Weekly tables to write, each a comma-separated list of dimensions "
+            f"from {', '.join(DIMENSIONS)} (default: {' '.join(DEFAULT_TABLES)})."
+        ),
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["csv", "columnar"],
+        default=["csv", "columnar"],
+        help="Output formats per table: csv export and/or the memory-mappable columnar file (default: both).",
+    )
+    parser.add_argument(
+        "--timezone",
+        default=DEFAULT_TIMEZONE,
+        help=f"IANA time zone whose local Monday starts each week (default: {DEFAULT_TIMEZONE}; use UTC for UTC weeks).",
+    )
+    parser.add_argument(
+        "--trend-series",
+        nargs="+",
+        default=DEFAULT_TREND_SERIES,
+        help=(
+            "Series to write rolling trend metrics for, each a comma-separated list of dimensions "
+            f"(default: {' '.join(DEFAULT_TREND_SERIES)})."
+        ),
+    )
+    parser.add_argument(
+        "--trend-window",
+        type=int,
+        default=4,
+        help="Weeks in the moving average and in the z-score baseline (default: 4).",
+    )
+    parser.add_argument(
+        "--anomaly-z",
+        type=float,
+        default=3.0,
+        help="Flag a week as an anomaly when |z-score| against the trend window is at least this (default: 3.0).",
+    )
+    parser.add_argument(
+        "--close-tables",
+        nargs="+",
+        default=DEFAULT_CLOSE_TABLES,
+        help=(
+            "Time-to-close quantile tables (p50/p90/p99 days), each a comma-separated list of dimensions "
+            f"(default: {' '.join(DEFAULT_CLOSE_TABLES)})."
+        ),
+    )
+    add_metrics_arguments(parser)
+    return parser
+
+
+def run(
+    args: argparse.Namespace,
+    partition_records: dict[str, list[CompactRecord]] | None = None,
+    metrics: RunMetrics | None = None,
+) -> dict:
+    """
+    Build and publish the Gold outputs. `partition_records` (from an in-process Silver run)
+    saves re-reading changed Silver partitions. Phases, bytes read/written and the Gold stats
+    are recorded in `metrics`. Returns {"published": bool, "manifest": path}.
+    """
+    metrics = metrics or RunMetrics("build_weekly_trends")
+    if args.trend_window < 2:
+        raise SystemExit("--trend-window must be at least 2")
+
+    tables = [parse_table(spec) for spec in args.tables]
+    trend_series = [parse_table(spec) for spec in args.trend_series]
+    close_tables = [parse_table(spec) for spec in args.close_tables]
+    grain = finest_grain(tables + trend_series + close_tables)
+
+    path = current_silver(args.silver_file)
+    if path is None:
         raise SystemExit("No silver files found in data/silver")
-    
-    payload = load_records(path)
-    if not isinstance(payload, list):
-        raise SystemExit("Not a list")
-    if len(payload) == 0:
-        raise SystemExit("No records found in silver file")
-    
-    stats = {
-        "input_records": 0,
-        "produced_rows": 0,
-        "invalid_or_missing_ts": 0,
-        "unknown_local_area_count": 0,
-        "unknown_department_count": 0,
-        "unknown_any_count": 0,
-        "unknown_both_count": 0,
-        "missing_fields_local_area": 0,
-        "missing_fields_department": 0,
-        "empty_local_area_value": 0,
-        "empty_department_value": 0,
-        "min_week_start_date": "",
-        "max_week_start_date": "",
-        "sum_of_request_count_in_week_and_area": 0,
-        "sum_of_request_count_in_week_area_and_dept": 0,
-        "week_and_area_csv_output_path": "",
-        "week_area_and_dept_csv_output_path": "",
-        "week_and_area_row_csv_count": 0,
-        "week_area_and_dept_row_csv_count": 0
-    }
-    stats["input_records"] = len(payload)
-
-    rows: list[dict] = []
-    
-    sample_missing_local_area_key : dict = {}
-    sample_missing_department_key : dict = {}
-    sample_empty_local_area_value : dict = {}
-    sample_empty_department_value : dict = {}
-    for r in payload:
-        fields = r.get("fields", {})
-        dt = _to_dt(fields.get("service_request_open_timestamp"))
-        if dt == DT_MIN:
-            stats["invalid_or_missing_ts"] += 1
-            continue
+    out_dir = Path("data/gold")
+
+    with metrics.phase("aggregate") as aggregate_phase:
+        partition_counts = None
+        if path.name == INDEX_NAME:
+            index_path = path
+            state_path = out_dir / GOLD_STATE_NAME
+            if not args.full:
+                metrics.add_read(file_size(state_path))
+            state = GoldState(grain, args.timezone) if args.full else GoldState.load(state_path, grain, args.timezone)
+            partition_counts = state.update(index_path, partition_records)
+            metrics.add_read(partition_counts["bytes_read"])
+            if partition_counts["reaggregated"] or partition_counts["partitions_removed"]:
+                state.save(state_path)
+                metrics.add_written(file_size(state_path))
+            agg = state.to_aggregate()
+            aggregate_phase["records"] = partition_counts["records_read"]
         else:
-            week_day = dt.weekday()
-            raw_week_start_date = dt - timedelta(days=week_day)
-            clean_week_start_date = raw_week_start_date.date().strftime("%Y-%m-%d")
-            stats["min_week_start_date"] = clean_week_start_date if stats["min_week_start_date"] == "" or clean_week_start_date < stats["min_week_start_date"] else stats["min_week_start_date"]
-            stats["max_week_start_date"] = clean_week_start_date if stats["max_week_start_date"] == "" or clean_week_start_date > stats["max_week_start_date"] else stats["max_week_start_date"]
-     
-        local_area_info = get_field("local_area", fields)
-        local_area = local_area_info.get("value")
-        if local_area == "UNKNOWN":
-            stats["unknown_local_area_count"] += 1
-            if local_area_info.get("missing_key"):
-                stats["missing_fields_local_area"] += 1
-                sample_missing_local_area_key = r if not sample_missing_local_area_key else sample_missing_local_area_key
-            elif local_area_info.get("empty_value"):
-                stats["empty_local_area_value"] += 1
-                sample_empty_local_area_value = r if not sample_empty_local_area_value else sample_empty_local_area_value
-        
-        department_info = get_field("department", fields)
-        department = department_info.get("value")
-        if department == "UNKNOWN":
-            stats["unknown_department_count"] += 1
-            if department_info.get("missing_key"):
-                stats["missing_fields_department"] += 1
-                sample_missing_department_key = r if not sample_missing_department_key else sample_missing_department_key
-            elif department_info.get("empty_value"):
-                stats["empty_department_value"] += 1
-                sample_empty_department_value = r if not sample_empty_department_value else sample_empty_department_value   
-       
-        row = {
-            "week_start_date": clean_week_start_date,
-            "local_area": local_area,
-            "department": department
-        }
-        rows.append(row)
+            agg = aggregate_records(load_records(path), grain, args.timezone)
+            metrics.add_read(file_size(path))
+            aggregate_phase["records"] = agg["stats"]["input_records"]
+
+    if agg["stats"]["input_records"] == 0:
+        raise SystemExit("No records found in silver file")
 
-        stats["produced_rows"] += 1
-        if department == "UNKNOWN" or local_area == "UNKNOWN":
-            stats["unknown_any_count"] += 1
-        if department == "UNKNOWN" and local_area == "UNKNOWN":
-            stats["unknown_both_count"] += 1
+    stats = agg["stats"]
+    metrics.add_stats("gold", stats)
+    if partition_counts is not None:
+        metrics.add_stats("gold_partitions", partition_counts)
+    sample_missing_local_area_key = agg["samples"]["missing_local_area_key"]
+    sample_missing_department_key = agg["samples"]["missing_department_key"]
+    sample_empty_local_area_value = agg["samples"]["empty_local_area_value"]
+    sample_empty_department_value = agg["samples"]["empty_department_value"]
 
     def sample_to_json(sample: dict) -> str:
         if not sample:
             return "None found"
         return json.dumps(sample, indent=2)
-    
-    week_and_area_counts: dict[tuple[str, str], int] = {}
-    week_area_and_dept_counts: dict[tuple[str, str, str], int] = {}
-    for r in rows:
-        week_and_area = (r["week_start_date"], r["local_area"])
-        week_and_area_counts[week_and_area] = week_and_area_counts[week_and_area] + 1 if week_and_area in week_and_area_counts else 1 
-
-        week_area_and_dept = (r["week_start_date"], r["local_area"], r["department"])
-        week_area_and_dept_counts[week_area_and_dept] = week_area_and_dept_counts[week_area_and_dept] + 1 if week_area_and_dept in week_area_and_dept_counts else 1
 
-    
-    week_and_area_rows: list[dict] = []
-    for (week_start_date, local_area), count in week_and_area_counts.items():
-        week_and_area_rows.append({
-            "week_start_date": week_start_date,
-            "local_area": local_area,
-            "request_count": count
-        })
-    week_and_area_rows.sort(key=itemgetter("week_start_date", "local_area"))
-
-    week_area_and_dept_rows: list[dict] = []
-    for (week_start_date, local_area, department), count in week_area_and_dept_counts.items():
-        week_area_and_dept_rows.append({
-            "week_start_date": week_start_date,
-            "local_area": local_area,
-            "department": department,
-            "request_count": count
-        })
-    week_area_and_dept_rows.sort(key=itemgetter("week_start_date", "local_area", "department"))
-
-    stats["sum_of_request_count_in_week_and_area"] = sum(r["request_count"] for r in week_and_area_rows)
-    stats["sum_of_request_count_in_week_area_and_dept"] = sum(r["request_count"] for r in week_area_and_dept_rows)
-
-    out_dir = Path("data/gold")
     out_dir.mkdir(parents=True, exist_ok=True)
     run_ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    out_path_week_area = out_dir / f"311_requests__gold_weekly_by_local_area__{run_ts}.csv"
-    out_path_week_area_dept = out_dir / f"311_requests__gold_weekly_by_local_area_and_department__{run_ts}.csv"
-    stats["week_and_area_csv_output_path"] = str(out_path_week_area)
-    stats["week_area_and_dept_csv_output_path"] = str(out_path_week_area_dept)
-
-    with open(out_path_week_area, "w", encoding="utf-8", newline="") as f:
-        if  not week_and_area_rows:
-            raise SystemExit("No rows to write for week and area CSV")
-        fieldnames = week_and_area_rows[0].keys()
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="raise")
-        writer.writeheader()
-        writer.writerows(week_and_area_rows)
-
-    with open(out_path_week_area_dept, "w", encoding="utf-8", newline="") as f:
-        if not week_area_and_dept_rows:
-            raise SystemExit("No rows to write for week, area and dept CSV")
-        fieldnames = week_area_and_dept_rows[0].keys()
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="raise")
-        writer.writeheader()
-        writer.writerows(week_area_and_dept_rows)
-
-    def row_count_csv(path: Path) -> int:
-        with open(path, "r", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            next(reader)  # skip header
-            return sum(1 for _ in reader)
-
-    stats["week_and_area_row_csv_count"] = row_count_csv(out_path_week_area)
-    stats["week_area_and_dept_row_csv_count"] = row_count_csv(out_path_week_area_dept)
+    # Outputs are rendered in memory, hashed and only written when they differ from the manifest
+    publisher = GoldPublisher(out_dir, run_ts, on_write=metrics.add_written)
 
-    
+    # Every table is a rollup of the finest-grain counts: no extra pass over the records
+    with metrics.phase("tables"):
+        outputs: list[dict] = []
+        for table in tables:
+            name = table_name(table)
+            table_counts = rollup(agg["counts"], grain, table)
+            if not table_counts:
+                raise SystemExit(f"No rows to write for {name}")
+            out = {"table": name, "sum_of_request_count": sum(table_counts.values())}
+
+            if "csv" in args.formats:
+                body, rows = csv_bytes([WEEK_COLUMN, *table, "request_count"], ((*group, count) for group, count in sorted(table_counts.items())))
+                out["csv"] = publisher.publish(name, "csv", ".csv", body, rows)
+
+            if "columnar" in args.formats:
+                out["columnar"] = publisher.publish(name, "columnar", COLUMNAR_SUFFIX, encode_table(list(table), table_counts), len(table_counts))
+
+            outputs.append(out)
+
+    # Rolling metrics resume from the previous run's per-series windows when past weeks are unchanged
+    with metrics.phase("trends"):
+        trend_state_path = out_dir / TREND_STATE_NAME
+        trend_config = {"window": args.trend_window, "anomaly_z": args.anomaly_z, "timezone": args.timezone}
+        previous_trends = load_trend_state(trend_state_path, trend_config)
+        trend_states: dict[str, dict] = {}
+        trend_outputs: list[dict] = []
+        for series in trend_series:
+            name = trend_name(series)
+            trend_rows, trend_states[name], weeks_computed = compute_trends(
+                rollup(agg["counts"], grain, series), args.trend_window, args.anomaly_z, previous_trends.get(name)
+            )
+            body, rows = csv_bytes(
+                [WEEK_COLUMN, *series, *TREND_COLUMNS],
+                ([row[WEEK_COLUMN], *row["series"], *("" if row[c] is None else row[c] for c in TREND_COLUMNS)] for row in trend_rows),
+            )
+            trend_outputs.append({
+                "table": name,
+                "csv": publisher.publish(name, "csv", ".csv", body, rows),
+                "anomalies": sum(row["is_anomaly"] for row in trend_rows),
+                "weeks_computed": weeks_computed,
+            })
+        if trend_states != previous_trends:
+            save_trend_state(trend_state_path, trend_config, trend_states)
+            metrics.add_written(file_size(trend_state_path))
+
+    # Time-to-close quantiles: finest-grain sketches merged up to each table
+    with metrics.phase("close_times"):
+        close_outputs: list[dict] = []
+        for table in close_tables:
+            name = close_table_name(table)
+            body, rows = csv_bytes(
+                [WEEK_COLUMN, *table, "closed_count", *QUANTILE_COLUMNS],
+                ([*key, closed, *quantiles] for key, closed, quantiles in close_time_rows(rollup_sketches(agg["close_sketches"], grain, table))),
+            )
+            close_outputs.append({"table": name, "csv": publisher.publish(name, "csv", ".csv", body, rows)})
+
+    with metrics.phase("publish"):
+        published = publisher.commit()
 
     print(f"Loaded Silver file:{path}")
-    print(f"Records:{len(payload)}")
+    if partition_counts is not None:
+        print(
+            f"Week partitions: {partition_counts['partitions']} "
+            f"(re-read: {partition_counts['reaggregated']}, unchanged: {partition_counts['reused']})"
+        )
+        print(
+            f"Gold deltas: {partition_counts['records_changed']} record(s) added/changed, "
+            f"{partition_counts['records_removed']} removed"
+        )
+    print(f"Records:{stats['input_records']}")
     print("\n---Gold Weekly Stats---")
     print("Input records:", stats["input_records"])
     print("Produced rows:", stats["produced_rows"])
@@ -232,6 +637,9 @@ def main() -> None:
     print("Missing fields - department:", stats["missing_fields_department"])
     print("Empty local area value:", stats["empty_local_area_value"])
     print("Empty department value:", stats["empty_department_value"])
+    print("Closed requests with a time to close:", stats["closed_records"])
+    print("Close date before open date (no time to close):", stats["close_before_open"])
+    print("Week start time zone:", args.timezone)
     print("Min week start date:", stats["min_week_start_date"])
     print("Max week start date:", stats["max_week_start_date"])
     print("\n---Sample Records---")
@@ -240,11 +648,36 @@ def main() -> None:
     print("Sample empty local area value:", sample_to_json(sample_empty_local_area_value))
     print("Sample empty department value:", sample_to_json(sample_empty_department_value))
     print("\n---Request Count Verification---")
-    print("Sum of request_count in week and area:", stats["sum_of_request_count_in_week_and_area"])
-    print("Sum of request_count in week, area and dept:", stats["sum_of_request_count_in_week_area_and_dept"])
-    print("\n---Output CSVs---")
-    print(f"Week and Area CSV Path: {stats['week_and_area_csv_output_path']}, Rows: {stats['week_and_area_row_csv_count']}")
-    print(f"Week, Area and Dept CSV Path: {stats['week_area_and_dept_csv_output_path']}, Rows: {stats['week_area_and_dept_row_csv_count']}")    
+    for out in outputs:
+        print(f"Sum of request_count in {out['table']}:", out["sum_of_request_count"])
+    print("\n---Outputs---")
+
+    def output_line(out: dict, fmt: str, extra: str = "") -> str:
+        entry = out[fmt]
+        state = "written" if entry["file"] in publisher.written else "unchanged"
+        label = "CSV" if fmt == "csv" else fmt
+        return f"{out['table']} {label} Path: {out_dir / entry['file']}, Rows: {entry['rows']}{extra} ({state})"
+
+    for out in outputs:
+        for fmt in ("csv", "columnar"):
+            if fmt in out:
+                print(output_line(out, fmt))
+    for out in trend_outputs:
+        print(output_line(out, "csv", f", Anomalies: {out['anomalies']}, Weeks computed: {out['weeks_computed']}"))
+    for out in close_outputs:
+        print(output_line(out, "csv"))
+    if published:
+        print(f"Manifest: {out_dir / MANIFEST_NAME} ({len(publisher.written)} output(s) written)")
+    else:
+        print(f"No output changed since {publisher.previous['published_at']}; nothing written.")
+    return {"published": published, "manifest": out_dir / MANIFEST_NAME}
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    with instrumented("build_weekly_trends", args) as metrics:
+        run(args, metrics=metrics)
+
 
 if __name__ == "__main__":
     main()
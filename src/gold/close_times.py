@@ -0,0 +1,57 @@
+from ..silver.compact import CompactRecord
+from .quantiles import KLLSketch
+
+# Time to close is reported at these quantiles, in days
+CLOSE_QUANTILES = (0.5, 0.9, 0.99)
+QUANTILE_COLUMNS = ["p50_days", "p90_days", "p99_days"]
+CLOSE_SKETCH_K = 200
+DEFAULT_CLOSE_TABLES = ["local_area,department"]
+
+
+def days_to_close(c: CompactRecord, open_day: int | None) -> int | None:
+    """
+    Whole days from the local open date to the close date (0 = closed the day it was opened);
+    None when the request is not closed, has no open timestamp, or closes before it opens.
+    """
+    if c.close_day is None or open_day is None or c.close_day < open_day:
+        return None
+    return c.close_day - open_day
+
+
+def add_close_time(sketches: dict[tuple[str, ...], KLLSketch], key: tuple[str, ...], days: int) -> None:
+    sketch = sketches.get(key)
+    if sketch is None:
+        sketch = sketches[key] = KLLSketch(CLOSE_SKETCH_K)
+    sketch.add(days)
+
+
+def merge_sketches(into: dict[tuple[str, ...], KLLSketch], other: dict[tuple[str, ...], KLLSketch]) -> None:
+    """Merge `other` key by key into `into` (e.g. two partitions, or two runs)."""
+    for key, sketch in other.items():
+        into[key] = into[key].merge(sketch) if key in into else sketch
+
+
+def rollup_sketches(
+    sketches: dict[tuple[str, ...], KLLSketch],
+    grain: tuple[str, ...],
+    table: tuple[str, ...],
+) -> dict[tuple[str, ...], KLLSketch]:
+    """cube.rollup for sketches: merge finest-grain sketches (keys: week, *grain) up to (week, *table)."""
+    if table == grain:
+        return dict(sketches)
+    positions = [0] + [1 + grain.index(d) for d in table]
+    out: dict[tuple[str, ...], KLLSketch] = {}
+    for key, sketch in sketches.items():
+        group = tuple(key[i] for i in positions)
+        out[group] = out[group].merge(sketch) if group in out else sketch
+    return out
+
+
+def close_time_rows(sketches: dict[tuple[str, ...], KLLSketch]) -> list[tuple[tuple[str, ...], int, list[float | None]]]:
+    """(key, closed requests, [p50, p90, p99]) per key, sorted by key."""
+    return [(key, sketches[key].n, sketches[key].quantiles(list(CLOSE_QUANTILES))) for key in sorted(sketches)]
+
+
+def close_table_name(table: tuple[str, ...]) -> str:
+    """File-name part for a time-to-close table, e.g. time_to_close_by_local_area_and_department."""
+    return "time_to_close_by_" + "_and_".join(table) if table else "time_to_close_total"
@@ -0,0 +1,194 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
+
+from .cube import WEEK_COLUMN
+from .publish import published_files
+
+MAGIC = b"GCOL1\0\0\0"
+COLUMNAR_SUFFIX = ".gcol"
+COUNT_COLUMN = "request_count"
+_ALIGN = 8
+
+
+def _code_typecode(dictionary_size: int) -> str:
+    return "H" if dictionary_size <= 0xFFFF else "I"
+
+
+def encode_table(dims: list[str], counts: dict[tuple[str, ...], int]) -> bytes:
+    """
+    A Gold table as the bytes of a memory-mappable columnar file.
+
+    Layout: MAGIC, a little-endian uint32 header length, a JSON header (row count,
+    per-column dictionary, typecode and byte offset), then one 8-byte-aligned
+    little-endian array per column. Dimension values are dictionary-encoded: each
+    column stores integer codes into its sorted dictionary, so codes compare like
+    the values. Rows are sorted by (week_start_date, *dims), so a week range is a
+    contiguous block. Counts are int64.
+    """
+    columns = [WEEK_COLUMN, *dims]
+    keys = sorted(counts)
+    dictionaries = [sorted({key[i] for key in keys}) for i in range(len(columns))]
+
+    arrays: list[tuple[dict[str, Any], array]] = []
+    for i, (name, dictionary) in enumerate(zip(columns, dictionaries)):
+        code_of = {value: code for code, value in enumerate(dictionary)}
+        typecode = _code_typecode(len(dictionary))
+        arrays.append(({"name": name, "typecode": typecode, "dictionary": dictionary}, array(typecode, (code_of[key[i]] for key in keys))))
+    arrays.append(({"name": COUNT_COLUMN, "typecode": "q"}, array("q", (counts[key] for key in keys))))
+
+    # Offsets depend on the header length and the header holds the offsets: size it with placeholders first
+    def header_bytes(offsets: list[int]) -> bytes:
+        cols = [{**meta, "offset": off} for (meta, _), off in zip(arrays, offsets)]
+        return json.dumps({"rows": len(keys), "columns": cols}, separators=(",", ":")).encode("utf-8")
+
+    def layout(header_len: int) -> list[int]:
+        offsets = []
+        pos = len(MAGIC) + 4 + header_len
+        for _, arr in arrays:
+            pos += -pos % _ALIGN
+            offsets.append(pos)
+            pos += len(arr) * arr.itemsize
+        return offsets
+
+    header = header_bytes([0] * len(arrays))
+    while True:
+        offsets = layout(len(header))
+        new_header = header_bytes(offsets)
+        if len(new_header) == len(header):
+            header = new_header
+            break
+        header = new_header
+
+    out = bytearray(MAGIC)
+    out += struct.pack("<I", len(header))
+    out += header
+    for (_, arr), off in zip(arrays, offsets):
+        out += b"\0" * (off - len(out))
+        if sys.byteorder != "little":
+            arr.byteswap()
+        out += arr.tobytes()
+    return bytes(out)
+
+
+def latest_table_path(gold_dir: Path, table: str) -> Path | None:
+    """
+    Current columnar file for a table name such as weekly_by_local_area: the one in the
+    Gold manifest, else the newest by name (timestamps sort by name).
+    """
+    published = published_files(gold_dir, "columnar").get(table)
+    if published is not None:
+        return published
+    files = sorted(gold_dir.glob(f"311_requests__gold_{table}__*{COLUMNAR_SUFFIX}"))
+    return files[-1] if files else None
+
+
+class GoldTable:
+    """
+    Read-only view of a columnar Gold file. Columns are memory-mapped, so opening a
+    table reads only the small header; a query touches only the rows it needs.
+
+        with GoldTable(path) as table:
+            for row in table.query(weeks=("2026-01-05", "2026-02-02"), local_area="Kitsilano"):
+                ...
+    """
+
+    def __init__(self, path: Path) -> None:
+        if sys.byteorder != "little":
+            raise SystemExit("Columnar Gold files are little-endian; reading them on this platform is not supported.")
+        self.path = path
+        self._views: dict[str, memoryview] = {}
+        # The mapping keeps its own handle on the file, so the file itself is closed once mapped
+        with open(path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                raise SystemExit(f"Columnar Gold file is empty or unreadable: {path}") from e
+        if self._mm[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise SystemExit(f"Not a columnar Gold file: {path}")
+        try:
+            (header_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+            start = len(MAGIC) + 4
+            header = json.loads(self._mm[start : start + header_len])
+        except (struct.error, ValueError) as e:
+            self.close()
+            raise SystemExit(f"Columnar Gold file is truncated: {path}") from e
+        self.rows: int = header["rows"]
+        self.meta = {col["name"]: col for col in header["columns"]}
+        self.dimensions = [name for name in self.meta if name != COUNT_COLUMN]
+        self._code_of = {
+            name: {value: code for code, value in enumerate(col["dictionary"])}
+            for name, col in self.meta.items()
+            if "dictionary" in col
+        }
+        self._base = memoryview(self._mm)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        if hasattr(self, "_base"):
+            self._base.release()
+        self._mm.close()
+
+    def column(self, name: str) -> memoryview:
+        """Raw column: dictionary codes for a dimension, int64 counts for request_count (little-endian)."""
+        if name not in self._views:
+            col = self.meta.get(name)
+            if col is None:
+                raise KeyError(f"No column {name!r} in {self.path} (columns: {list(self.meta)})")
+            size = struct.calcsize(col["typecode"])
+            self._views[name] = self._base[col["offset"] : col["offset"] + self.rows * size].cast(col["typecode"])
+        return self._views[name]
+
+    def dictionary(self, name: str) -> list[str]:
+        return self.meta[name]["dictionary"]
+
+    def week_rows(self, start: str | None = None, end: str | None = None) -> range:
+        """Row range whose week_start_date is within [start, end] (either bound optional), by binary search."""
+        weeks = self.dictionary(WEEK_COLUMN)
+        codes = self.column(WEEK_COLUMN)
+        lo = 0 if start is None else bisect_left(codes, bisect_left(weeks, start))
+        hi = self.rows if end is None else bisect_right(codes, bisect_right(weeks, end) - 1)
+        return range(lo, max(lo, hi))
+
+    def query(self, weeks: tuple[str | None, str | None] = (None, None), **filters: str) -> Iterator[dict[str, Any]]:
+        """
+        Yield rows (as dicts) in a week range, keeping only rows whose dimensions equal `filters`,
+        e.g. local_area="Kitsilano". Filters on dimensions the table does not have raise KeyError.
+        """
+        wanted: list[tuple[memoryview, int]] = []
+        for name, value in filters.items():
+            if name not in self._code_of or name == COUNT_COLUMN:
+                raise KeyError(f"No dimension {name!r} in {self.path} (dimensions: {self.dimensions})")
+            code = self._code_of[name].get(value)
+            if code is None:
+                return
+            wanted.append((self.column(name), code))
+
+        dims = [(name, self.column(name), self.dictionary(name)) for name in self.dimensions]
+        counts = self.column(COUNT_COLUMN)
+        for i in self.week_rows(*weeks):
+            if all(col[i] == code for col, code in wanted):
+                row = {name: dictionary[col[i]] for name, col, dictionary in dims}
+                row[COUNT_COLUMN] = counts[i]
+                yield row
@@ -0,0 +1,45 @@
+from ..silver.compact import CATEGORICAL_FIELDS
+
+WEEK_COLUMN = "week_start_date"
+DIMENSIONS = CATEGORICAL_FIELDS
+# The two original Gold tables: by local_area, and by local_area + department
+DEFAULT_TABLES = ["local_area", "local_area,department"]
+
+
+def parse_table(spec: str) -> tuple[str, ...]:
+    """'local_area,department' -> ('local_area', 'department'); every table is also grouped by week."""
+    dims = tuple(d.strip() for d in spec.split(",") if d.strip())
+    unknown = [d for d in dims if d not in DIMENSIONS]
+    if unknown:
+        raise SystemExit(f"Unknown dimension(s) {unknown} in table {spec!r} (choose from {list(DIMENSIONS)})")
+    if len(set(dims)) != len(dims):
+        raise SystemExit(f"Repeated dimension in table {spec!r}")
+    return dims
+
+
+def finest_grain(tables: list[tuple[str, ...]]) -> tuple[str, ...]:
+    """Union of the tables' dimensions, in first-seen order: the only grain that is counted."""
+    grain: list[str] = []
+    for table in tables:
+        grain.extend(d for d in table if d not in grain)
+    return tuple(grain)
+
+
+def rollup(counts: dict[tuple[str, ...], int], grain: tuple[str, ...], table: tuple[str, ...]) -> dict[tuple[str, ...], int]:
+    """
+    Sum finest-grain counts (keys: week, *grain) up to (week, *table).
+    `table` must be a subset of `grain`; its columns come out in the table's own order.
+    """
+    if table == grain:
+        return dict(counts)
+    positions = [0] + [1 + grain.index(d) for d in table]
+    out: dict[tuple[str, ...], int] = {}
+    for key, count in counts.items():
+        group = tuple(key[i] for i in positions)
+        out[group] = out.get(group, 0) + count
+    return out
+
+
+def table_name(table: tuple[str, ...]) -> str:
+    """File-name part for a table, e.g. weekly_by_local_area_and_department."""
+    return "weekly_by_" + "_and_".join(table) if table else "weekly_total"
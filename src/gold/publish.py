@@ -0,0 +1,108 @@
+import csv
+import hashlib
+import io
+import json
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+MANIFEST_NAME = "_manifest.json"
+
+
+def csv_bytes(header: list[str], rows: Iterable[Iterable[Any]]) -> tuple[bytes, int]:
+    """A CSV file's bytes (same dialect as csv.writer on a file opened with newline="") and its row count."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    n = 0
+    for row in rows:
+        writer.writerow(row)
+        n += 1
+    return buf.getvalue().encode("utf-8"), n
+
+
+def load_manifest(gold_dir: Path) -> dict[str, Any]:
+    """
+    Manifest of the published Gold outputs:
+    {"published_at": "<run timestamp>", "outputs": {"<table>.<ext>": {"file", "table", "format", "rows", "bytes", "sha256"}}}
+    """
+    path = gold_dir / MANIFEST_NAME
+    if not path.exists():
+        return {"published_at": None, "outputs": {}}
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise SystemExit(f"Gold manifest is not valid JSON: {path} (delete it to republish every output)") from e
+    manifest.setdefault("published_at", None)
+    manifest.setdefault("outputs", {})
+    return manifest
+
+
+def published_files(gold_dir: Path, fmt: str) -> dict[str, Path]:
+    """table -> current file of that format, according to the manifest ({} when there is none)."""
+    outputs = load_manifest(gold_dir)["outputs"].values()
+    return {out["table"]: gold_dir / out["file"] for out in outputs if out["format"] == fmt}
+
+
+class GoldPublisher:
+    """
+    Publishes one run's outputs next to the previous manifest.
+
+    Every output is rendered to bytes first and hashed. An output whose hash matches
+    the manifest (and whose file is still there) is not written again; a changed one is
+    written to a temporary file and renamed into place. The manifest is replaced last,
+    atomically, so a reader that follows it only ever sees complete files. When every
+    output is unchanged nothing is written at all, manifest included.
+    """
+
+    def __init__(self, gold_dir: Path, run_ts: str, on_write: Callable[[int], None] | None = None) -> None:
+        self.gold_dir = gold_dir
+        # Called with the size of every file written (outputs and manifest), e.g. for run metrics
+        self.on_write = on_write
+        self.run_ts = run_ts
+        self.previous = load_manifest(gold_dir)
+        self.outputs: dict[str, dict[str, Any]] = {}
+        self.written: list[str] = []
+
+    def publish(self, table: str, fmt: str, suffix: str, body: bytes, rows: int) -> dict[str, Any]:
+        """Stage one output (e.g. table weekly_by_local_area, format csv); returns its manifest entry."""
+        name = f"{table}{suffix}"
+        sha = hashlib.sha256(body).hexdigest()
+        prev = self.previous["outputs"].get(name)
+        if prev is not None and prev["sha256"] == sha and (self.gold_dir / prev["file"]).exists():
+            self.outputs[name] = prev
+            return prev
+        entry = {
+            "file": f"311_requests__gold_{table}__{self.run_ts}{suffix}",
+            "table": table,
+            "format": fmt,
+            "rows": rows,
+            "bytes": len(body),
+            "sha256": sha,
+        }
+        path = self.gold_dir / entry["file"]
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(body)
+        tmp_path.replace(path)
+        if self.on_write is not None:
+            self.on_write(len(body))
+        self.outputs[name] = entry
+        self.written.append(entry["file"])
+        return entry
+
+    def changed(self) -> bool:
+        return bool(self.written) or set(self.outputs) != set(self.previous["outputs"])
+
+    def commit(self) -> bool:
+        """Replace the manifest if any output changed; returns whether it did."""
+        if not self.changed():
+            return False
+        manifest = {"published_at": self.run_ts, "outputs": dict(sorted(self.outputs.items()))}
+        path = self.gold_dir / MANIFEST_NAME
+        tmp_path = path.with_name(MANIFEST_NAME + ".tmp")
+        body = json.dumps(manifest, indent=2).encode("utf-8")
+        tmp_path.write_bytes(body)
+        tmp_path.replace(path)
+        if self.on_write is not None:
+            self.on_write(len(body))
+        return True
@@ -0,0 +1,104 @@
+import math
+from typing import Any
+
+
+class KLLSketch:
+    """
+    Quantiles of a numeric stream in O(k log(n/k)) memory (Karnin, Lang & Liberty).
+
+    Items sit in levels; an item on level h stands for 2**h inputs. When the sketch
+    is full, the lowest level over its capacity is sorted and every other item is
+    promoted one level up. Compactions alternate between keeping odd and even positions
+    instead of flipping a coin, so the same input always gives the same sketch.
+    Until the first compaction (n < k) quantiles are exact. Sketches with the same k
+    merge by concatenating levels and compacting again.
+    """
+
+    SHRINK = 2 / 3
+
+    def __init__(self, k: int = 200) -> None:
+        if k < 8:
+            raise ValueError("k must be >= 8")
+        self.k = k
+        self.n = 0
+        self.levels: list[list[float]] = [[]]
+        self.parity = [0]
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, h: int) -> int:
+        # Lower levels get geometrically smaller capacities; the top level gets k
+        return max(2, math.ceil(self.k * self.SHRINK ** (len(self.levels) - h - 1)))
+
+    def _grow(self) -> None:
+        self.levels.append([])
+        self.parity.append(0)
+        self._max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self) -> None:
+        for h in range(len(self.levels)):
+            level = self.levels[h]
+            if len(level) < self._capacity(h):
+                continue
+            if h + 1 == len(self.levels):
+                self._grow()
+            level.sort()
+            # An odd item out (the smallest) stays on this level so total weight is kept
+            keep = len(level) % 2
+            promoted = level[keep + self.parity[h] :: 2]
+            self.parity[h] ^= 1
+            self.levels[h + 1].extend(promoted)
+            self._size -= len(level) - keep - len(promoted)
+            del level[keep:]
+            if self._size < self._max_size:
+                return
+
+    def add(self, value: float) -> None:
+        self.levels[0].append(value)
+        self.n += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        if other.k != self.k:
+            raise ValueError("Cannot merge KLL sketches with different k")
+        merged = KLLSketch.from_json(self.to_json())
+        while len(merged.levels) < len(other.levels):
+            merged._grow()
+        for h, level in enumerate(other.levels):
+            merged.levels[h].extend(level)
+        merged.n += other.n
+        merged._size += other._size
+        while merged._size >= merged._max_size:
+            merged._compress()
+        return merged
+
+    def quantiles(self, qs: list[float]) -> list[float | None]:
+        """Nearest-rank value for each q in [0, 1] (None for an empty sketch)."""
+        if not self.n:
+            return [None for _ in qs]
+        weighted = sorted((v, 1 << h) for h, level in enumerate(self.levels) for v in level)
+        out = []
+        for q in qs:
+            target = max(1, math.ceil(q * self.n))
+            seen = 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= target:
+                    break
+            out.append(value)
+        return out
+
+    def to_json(self) -> dict[str, Any]:
+        return {"k": self.k, "n": self.n, "levels": [list(level) for level in self.levels], "parity": list(self.parity)}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "KLLSketch":
+        sketch = cls(data["k"])
+        sketch.n = data["n"]
+        sketch.levels = [list(level) for level in data["levels"]]
+        sketch.parity = list(data["parity"])
+        sketch._size = sum(len(level) for level in sketch.levels)
+        sketch._max_size = sum(sketch._capacity(h) for h in range(len(sketch.levels)))
+        return sketch
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import math
+from collections import deque
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from .cube import WEEK_COLUMN
+
+TREND_COLUMNS = ["request_count", "wow_delta", "moving_avg", "zscore", "is_anomaly"]
+DEFAULT_TREND_SERIES = ["local_area", "department"]
+
+
+class RollingWindow:
+    """Last `size` values with running sum and sum of squares: push, mean and std are O(1)."""
+
+    __slots__ = ("size", "total", "total_sq", "values")
+
+    def __init__(self, size: int, values: list[int] | None = None) -> None:
+        self.size = size
+        self.values: deque[int] = deque()
+        self.total = 0
+        self.total_sq = 0
+        for v in values or []:
+            self.push(v)
+
+    def push(self, value: int) -> None:
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+
+    def mean(self) -> float:
+        return self.total / len(self.values)
+
+    def std(self) -> float:
+        n = len(self.values)
+        # counts are ints, so the sums are exact and the variance cannot go slightly negative
+        return math.sqrt((self.total_sq * n - self.total * self.total) / (n * n))
+
+
+class SeriesTrends:
+    """
+    Week-by-week trend metrics for many series at once.
+
+    Each series keeps its previous count and a window of its last N weeks. A week's
+    z-score is measured against the N weeks before it; its moving average covers the
+    N weeks ending with it. `advance` moves every series one week forward, so a week
+    costs O(series) no matter how much history came before. A series starts at its first non-zero week;
+    after that, weeks without requests count as 0.
+    """
+
+    def __init__(self, window: int, z_threshold: float) -> None:
+        self.window = window
+        self.z_threshold = z_threshold
+        self.series: dict[tuple[str, ...], tuple[int, RollingWindow]] = {}
+
+    def advance(self, week: str, counts: dict[tuple[str, ...], int]) -> list[dict[str, Any]]:
+        for key in counts:
+            if key not in self.series:
+                self.series[key] = (0, RollingWindow(self.window))
+
+        rows = []
+        for key in sorted(self.series):
+            prev, history = self.series[key]
+            count = counts.get(key, 0)
+            zscore = None
+            if len(history.values) >= 2 and history.std() > 0:
+                zscore = (count - history.mean()) / history.std()
+            # Moving average over the window after this week is pushed, without pushing it yet
+            if len(history.values) == self.window:
+                moving_avg = (history.total - history.values[0] + count) / self.window
+            else:
+                moving_avg = (history.total + count) / (len(history.values) + 1)
+            rows.append({
+                WEEK_COLUMN: week,
+                "series": key,
+                "request_count": count,
+                "wow_delta": count - prev if history.values else None,
+                "moving_avg": round(moving_avg, 3),
+                "zscore": None if zscore is None else round(zscore, 3),
+                "is_anomaly": int(zscore is not None and abs(zscore) >= self.z_threshold),
+            })
+            history.push(count)
+            self.series[key] = (count, history)
+        return rows
+
+    def to_json(self) -> list:
+        return [[list(key), prev, list(history.values)] for key, (prev, history) in self.series.items()]
+
+    def load_json(self, data: list) -> None:
+        self.series = {tuple(key): (prev, RollingWindow(self.window, values)) for key, prev, values in data}
+
+
+def week_calendar(first: str, last: str) -> list[str]:
+    """Every week start from first to last (inclusive), 7 days apart."""
+    day, end = date.fromisoformat(first), date.fromisoformat(last)
+    weeks = []
+    while day <= end:
+        weeks.append(day.isoformat())
+        day += timedelta(days=7)
+    return weeks
+
+
+def _week_digest(counts: dict[tuple[str, ...], int]) -> str:
+    return hashlib.blake2b(json.dumps(sorted(counts.items())).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def compute_trends(
+    table_counts: dict[tuple[str, ...], int],
+    window: int,
+    z_threshold: float,
+    previous: dict[str, Any] | None,
+) -> tuple[list[dict[str, Any]], dict[str, Any], int]:
+    """
+    Trend rows for one series table (keys: (week, *dims)), resuming from `previous` when possible.
+
+    The returned state keeps the metric rows and every series' window as of the second-to-last
+    week (the last week is usually still filling up), plus a digest of each week's counts.
+    If none of the weeks up to that checkpoint changed, the next run restores the windows and
+    only advances through the weeks after it; otherwise it starts from the first week.
+
+    Returns (rows, state, weeks_computed).
+    """
+    by_week: dict[str, dict[tuple[str, ...], int]] = {}
+    for (week, *dims), count in table_counts.items():
+        by_week.setdefault(week, {})[tuple(dims)] = count
+    if not by_week:
+        return [], {}, 0
+    weeks = week_calendar(min(by_week), max(by_week))
+    digests = {week: _week_digest(by_week[week]) for week in weeks if week in by_week}
+
+    trends = SeriesTrends(window, z_threshold)
+    rows: list[dict[str, Any]] = []
+    start = 0
+    if previous:
+        checkpoint = previous.get("checkpoint_week")
+        old = previous.get("digests", {})
+        if checkpoint in weeks and all(old.get(w) == digests.get(w) for w in weeks[: weeks.index(checkpoint) + 1]):
+            trends.load_json(previous["series"])
+            rows = [{**r, "series": tuple(r["series"])} for r in previous["rows"]]
+            start = weeks.index(checkpoint) + 1
+
+    state: dict[str, Any] = {"digests": digests}
+    checkpoint_at = len(weeks) - 2
+    if start > 0 and start > checkpoint_at:
+        # Nothing before the last week is new: keep the previous checkpoint as it is
+        state.update(checkpoint_week=previous["checkpoint_week"], series=previous["series"], rows=previous["rows"])
+    for i in range(start, len(weeks)):
+        rows.extend(trends.advance(weeks[i], by_week.get(weeks[i], {})))
+        if i == checkpoint_at:
+            state.update(checkpoint_week=weeks[i], series=trends.to_json(), rows=[{**r, "series": list(r["series"])} for r in rows])
+    return rows, state, len(weeks) - start
+
+
+def load_trend_state(path: Path, config: dict[str, Any]) -> dict[str, Any]:
+    """Saved trend checkpoints, or {} if missing or computed with other settings."""
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    return data.get("tables", {}) if data.get("config") == config else {}
+
+
+def save_trend_state(path: Path, config: dict[str, Any], tables: dict[str, Any]) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps({"config": config, "tables": tables}, separators=(",", ":")), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def trend_name(series: tuple[str, ...]) -> str:
+    """File-name part for a trend series, e.g. trends_by_local_area."""
+    return "trends_by_" + "_and_".join(series) if series else "trends_total"
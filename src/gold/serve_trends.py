@@ -0,0 +1,275 @@
+import argparse
+import hashlib
+import json
+import re
+import signal
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from ..metrics import RunMetrics, add_metrics_arguments, file_size, instrumented
+from .columnar import COLUMNAR_SUFFIX, COUNT_COLUMN, GoldTable
+from .cube import DIMENSIONS, WEEK_COLUMN
+from .publish import published_files
+
+TABLE_FILE_RE = re.compile(r"^311_requests__gold_(?P<table>weekly_\w+?)__(?P<ts>\d{8}T\d{6}Z)" + re.escape(COLUMNAR_SUFFIX) + "$")
+
+
+class TableIndex:
+    """
+    One Gold table held in memory: column lists plus, per dimension, value -> ascending row ids.
+    Rows are sorted by week, so row ids within a week range form one slice of each posting list.
+    """
+
+    def __init__(self, name: str, table: GoldTable) -> None:
+        self.name = name
+        self.dims = [d for d in table.dimensions if d != WEEK_COLUMN]
+        self.weeks = [table.dictionary(WEEK_COLUMN)[c] for c in table.column(WEEK_COLUMN)]
+        self.columns = {d: [table.dictionary(d)[c] for c in table.column(d)] for d in self.dims}
+        self.counts = table.column(COUNT_COLUMN).tolist()
+        self.postings: dict[str, dict[str, list[int]]] = {}
+        for d in self.dims:
+            postings: dict[str, list[int]] = {}
+            for i, value in enumerate(self.columns[d]):
+                postings.setdefault(value, []).append(i)
+            self.postings[d] = postings
+
+    def query(self, filters: dict[str, str], week_from: str | None, week_to: str | None) -> list[dict[str, Any]]:
+        lo = 0 if week_from is None else bisect_left(self.weeks, week_from)
+        hi = len(self.weeks) if week_to is None else bisect_right(self.weeks, week_to)
+        if filters:
+            lists = [self.postings[d].get(v, []) for d, v in filters.items()]
+            shortest = min(lists, key=len)
+            candidates = shortest[bisect_left(shortest, lo) : bisect_left(shortest, hi)]
+            rows = [i for i in candidates if all(self.columns[d][i] == v for d, v in filters.items())]
+        else:
+            rows = range(lo, hi)
+        return [
+            {WEEK_COLUMN: self.weeks[i], **{d: self.columns[d][i] for d in self.dims}, COUNT_COLUMN: self.counts[i]}
+            for i in rows
+        ]
+
+
+class Snapshot:
+    """The newest columnar file of every Gold table in a directory, loaded together."""
+
+    def __init__(self, gold_dir: Path) -> None:
+        self.files = latest_table_files(gold_dir)
+        self.signature = files_signature(self.files)
+        self.version = hashlib.blake2b(repr(self.signature).encode(), digest_size=8).hexdigest()
+        self.tables: dict[str, TableIndex] = {}
+        for name, path in self.files.items():
+            with GoldTable(path) as table:
+                self.tables[name] = TableIndex(name, table)
+
+    def pick_table(self, name: str | None, filters: dict[str, str]) -> TableIndex:
+        """The requested table, or the smallest one that has every filtered dimension."""
+        if name is not None:
+            if name not in self.tables:
+                raise LookupError(f"Unknown table {name!r}")
+            table = self.tables[name]
+            missing = [d for d in filters if d not in table.dims]
+            if missing:
+                raise LookupError(f"Table {name!r} has no dimension(s) {missing}")
+            return table
+        fitting = [t for t in self.tables.values() if all(d in t.dims for d in filters)]
+        if not fitting:
+            raise LookupError(f"No Gold table has all of {sorted(filters)}")
+        return min(fitting, key=lambda t: (len(t.dims), len(t.weeks), t.name))
+
+
+def latest_table_files(gold_dir: Path) -> dict[str, Path]:
+    """Table -> columnar file to serve: the ones in the Gold manifest, else the newest file of each table."""
+    published = published_files(gold_dir, "columnar")
+    if published:
+        return published
+    latest: dict[str, Path] = {}
+    for path in sorted(gold_dir.glob(f"311_requests__gold_*{COLUMNAR_SUFFIX}")):
+        m = TABLE_FILE_RE.match(path.name)
+        if m:
+            latest[m["table"]] = path
+    return latest
+
+
+def files_signature(files: dict[str, Path]) -> tuple:
+    sig = []
+    for name, path in sorted(files.items()):
+        st = path.stat()
+        sig.append((name, path.name, st.st_size, st.st_mtime_ns))
+    return tuple(sig)
+
+
+class TrendsService:
+    """
+    Holds the current Snapshot and an LRU cache of encoded responses keyed by
+    (snapshot version, normalized query). A background thread swaps in a new
+    Snapshot when newer Gold files land; in-flight requests keep the old one.
+    """
+
+    def __init__(self, gold_dir: Path, cache_size: int) -> None:
+        self.gold_dir = gold_dir
+        self.cache_size = cache_size
+        self.snapshot = Snapshot(gold_dir)
+        self._cache: OrderedDict[tuple, tuple[bytes, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.reloads = 0
+
+    def reload_if_changed(self) -> bool:
+        if files_signature(latest_table_files(self.gold_dir)) == self.snapshot.signature:
+            return False
+        snapshot = Snapshot(self.gold_dir)
+        with self._lock:
+            self.snapshot = snapshot
+            self._cache.clear()
+            self.reloads += 1
+        return True
+
+    def watch(self, interval_s: float) -> None:
+        while True:
+            time.sleep(interval_s)
+            try:
+                if self.reload_if_changed():
+                    print(f"Reloaded Gold tables (version {self.snapshot.version}): {', '.join(self.snapshot.tables)}")
+            except (OSError, SystemExit, ValueError) as e:
+                # A build may be mid-write; keep serving the current snapshot and retry next tick
+                print(f"Reload skipped: {e}")
+
+    def respond(self, path: str, params: dict[str, str]) -> tuple[int, bytes, str]:
+        """(status, JSON body, ETag) for a request, served from the LRU cache when possible."""
+        snapshot = self.snapshot
+        key = (snapshot.version, path, tuple(sorted(params.items())))
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return 200, *hit
+        try:
+            payload = self._answer(snapshot, path, params)
+        except LookupError as e:
+            return 404, json.dumps({"error": str(e)}).encode("utf-8"), ""
+        except ValueError as e:
+            return 400, json.dumps({"error": str(e)}).encode("utf-8"), ""
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        with self._lock:
+            self._cache[key] = (body, etag)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return 200, body, etag
+
+    def _answer(self, snapshot: Snapshot, path: str, params: dict[str, str]) -> dict[str, Any]:
+        if path == "/tables":
+            return {
+                "version": snapshot.version,
+                "tables": {
+                    name: {"dimensions": t.dims, "rows": len(t.weeks), "file": snapshot.files[name].name}
+                    for name, t in sorted(snapshot.tables.items())
+                },
+            }
+        if path != "/trends":
+            raise LookupError(f"Unknown path {path!r} (use /trends or /tables)")
+        params = dict(params)
+        table_name = params.pop("table", None)
+        week_from = params.pop("week_from", None)
+        week_to = params.pop("week_to", None)
+        unknown = [p for p in params if p not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown parameter(s) {unknown}; filters are {list(DIMENSIONS)}, table, week_from, week_to")
+        table = snapshot.pick_table(table_name, params)
+        rows = table.query(params, week_from, week_to)
+        return {
+            "version": snapshot.version,
+            "table": table.name,
+            "filters": params,
+            "week_from": week_from,
+            "week_to": week_to,
+            "total": sum(r[COUNT_COLUMN] for r in rows),
+            "rows": rows,
+        }
+
+
+def make_handler(service: TrendsService, verbose: bool, metrics: RunMetrics) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            t0 = time.perf_counter()
+            status, body = self._get()
+            # Latency from the parsed request line to the body handed to the socket
+            metrics.record_request(time.perf_counter() - t0, status, len(body))
+
+        def _get(self) -> tuple[int, bytes]:
+            url = urlsplit(self.path)
+            params = dict(parse_qsl(url.query))
+            status, body, etag = service.respond(url.path.rstrip("/") or "/", params)
+            if status == 200 and etag and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return 304, b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+            return status, body
+
+        def log_message(self, format: str, *args: Any) -> None:
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve weekly trend queries from the latest columnar Gold tables.")
+    parser.add_argument("--gold-dir", type=Path, default=Path("data/gold"), help="Directory with .gcol Gold tables (default: data/gold).")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8311, help="Port (default: 8311).")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Cached responses kept (LRU, default: 1024).")
+    parser.add_argument("--reload-interval", type=float, default=2.0, help="Seconds between checks for a new Gold build (default: 2).")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumented("serve_trends", args) as metrics:
+        with metrics.phase("load") as phase:
+            service = TrendsService(args.gold_dir, args.cache_size)
+            metrics.add_read(sum(file_size(f) for f in service.snapshot.files.values()))
+            phase["records"] = sum(len(t.weeks) for t in service.snapshot.tables.values())
+        if not service.snapshot.tables:
+            raise SystemExit(f"No columnar Gold tables in {args.gold_dir} (run build_weekly_trends with --formats columnar)")
+        threading.Thread(target=service.watch, args=(args.reload_interval,), daemon=True).start()
+
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(service, args.verbose, metrics))
+        print(f"Serving {', '.join(service.snapshot.tables)} on http://{args.host}:{args.port}/trends")
+        # Stop on SIGTERM (e.g. from a service manager) as on Ctrl-C, so the metrics file is written
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            with metrics.phase("serve"):
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+        finally:
+            server.server_close()
+            metrics.add_stats("serve", {
+                "tables": sorted(service.snapshot.tables),
+                "version": service.snapshot.version,
+                "reloads": service.reloads,
+                "cache_hits": service.cache_hits,
+            })
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from bisect import bisect_right
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta, timezone
+from functools import cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ..silver.compact import TS_MISSING, US_PER_DAY
+
+try:
+    import numpy as np
+except ImportError:  # optional: the pure-python path gives the same result
+    np = None
+
+DEFAULT_TIMEZONE = "America/Vancouver"
+# Transition tables cover this range; outside it the nearest known offset is used
+TABLE_START = datetime(1970, 1, 1, tzinfo=timezone.utc)
+TABLE_END = datetime(2100, 1, 1, tzinfo=timezone.utc)
+_US = 1_000_000
+
+
+@cache
+def transition_table(tz_name: str) -> tuple[list[int], list[int]]:
+    """
+    UTC-offset transitions of a zone as two parallel lists:
+    starts (epoch microseconds, ascending; the first is TS_MISSING) and the UTC offset
+    (microseconds) in effect from each start on.
+
+    Built once per zone by sampling the zone daily and bisecting every change
+    down to the second, so no datetime objects are needed per record afterwards.
+    """
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise SystemExit(f"Unknown time zone: {tz_name!r}") from e
+
+    def offset_at(epoch_s: int) -> int:
+        return int(datetime.fromtimestamp(epoch_s, tz).utcoffset().total_seconds())
+
+    start_s = int(TABLE_START.timestamp())
+    end_s = int(TABLE_END.timestamp())
+    starts = [TS_MISSING]
+    offsets = [offset_at(start_s) * _US]
+    prev_s, prev_off = start_s, offsets[0] // _US
+    for day_s in range(start_s + 86400, end_s, 86400):
+        off = offset_at(day_s)
+        if off != prev_off:
+            lo, hi = prev_s, day_s  # offset(lo) == prev_off, offset(hi) == off
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if offset_at(mid) == prev_off:
+                    lo = mid
+                else:
+                    hi = mid
+            starts.append(hi * _US)
+            offsets.append(off * _US)
+            prev_off = off
+        prev_s = day_s
+    return starts, offsets
+
+
+@cache
+def _monday_iso(day: int) -> str:
+    return (date(1970, 1, 1) + timedelta(days=day)).isoformat()
+
+
+@cache
+def week_of_day(day: int) -> str:
+    """Monday of the week containing a day number (days since 1970-01-01), as YYYY-MM-DD."""
+    # 1970-01-01 was a Thursday (weekday 3)
+    return _monday_iso(day - (day + 3) % 7)
+
+
+def local_days(ts_us: Sequence[int], tz_name: str = DEFAULT_TIMEZONE) -> list[int | None]:
+    """
+    Local calendar day in `tz_name` (days since 1970-01-01) of every epoch-microsecond
+    timestamp; None for TS_MISSING.
+
+    The whole batch is converted at once: each timestamp's UTC offset is looked up in the
+    zone's transition table (numpy searchsorted when available, else bisect), shifted to
+    local time, and floored to the day with integer arithmetic.
+    """
+    starts, offsets = transition_table(tz_name)
+    if np is not None and len(ts_us) > 64:
+        ts = np.asarray(ts_us, dtype=np.int64)
+        idx = np.searchsorted(np.asarray(starts, dtype=np.int64), ts, side="right") - 1
+        day = np.floor_divide(ts + np.asarray(offsets, dtype=np.int64)[idx], US_PER_DAY)
+        return [None if m else d for d, m in zip(day.tolist(), (ts == TS_MISSING).tolist())]
+    return [None if t == TS_MISSING else (t + offsets[bisect_right(starts, t) - 1]) // US_PER_DAY for t in ts_us]
+
+
+def local_week_starts(ts_us: Sequence[int], tz_name: str = DEFAULT_TIMEZONE) -> list[str | None]:
+    """Monday (local date in `tz_name`) of the week of every epoch-microsecond timestamp, as YYYY-MM-DD; None for TS_MISSING."""
+    return [None if day is None else week_of_day(day) for day in local_days(ts_us, tz_name)]
@@ -0,0 +1,330 @@
+import gzip
+import hashlib
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Self
+
+try:
+    # Python 3.14+
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+DT_MIN = datetime.min.replace(tzinfo=timezone.utc)
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+DEFAULT_COMPRESSION = "zstd" if zstd is not None else "gzip"
+RECORD_SUFFIXES = (".json", ".ndjson")
+
+
+def open_text(path: Path, mode: str = "rt", suffix: str | None = None) -> IO[str]:
+    """
+    Open a (possibly compressed) text file.
+    Compression is picked from `suffix` (default: the path's own suffix): .gz, .zst or plain.
+    """
+    suffix = path.suffix if suffix is None else suffix
+    if suffix == ".gz":
+        return gzip.open(path, mode, compresslevel=6, encoding="utf-8")
+    if suffix == ".zst":
+        if zstd is None:
+            raise SystemExit(f"Reading {path} needs zstd support (Python 3.14+ compression.zstd).")
+        return zstd.open(path, mode, encoding="utf-8")
+    return open(path, mode.replace("t", ""), encoding="utf-8")
+
+
+def record_suffix(path: Path) -> str:
+    """Format suffix with any compression suffix stripped, e.g. x.ndjson.gz -> .ndjson"""
+    if path.suffix in (".gz", ".zst"):
+        return Path(path.stem).suffix
+    return path.suffix
+
+
+def find_bronze_files(bronze_dir: Path, pattern: str = "*") -> list[Path]:
+    """
+    All Bronze record files under `bronze_dir` (including ingest_date=... partitions)
+    whose name matches `pattern`, in filename (i.e. run timestamp) order.
+    In-progress `.partial` files are never returned.
+    """
+    files = [
+        p for p in bronze_dir.rglob(pattern)
+        if p.is_file() and record_suffix(p) in RECORD_SUFFIXES
+    ]
+    return sorted(files, key=lambda p: (p.name, str(p)))
+
+
+def bronze_partition_dir(bronze_dir: Path, ingest_dt: datetime) -> Path:
+    return bronze_dir / f"ingest_date={ingest_dt.strftime('%Y-%m-%d')}"
+
+
+def normalize_iso_ts(s: str) -> str:
+    """
+    Normalize common API timestamp variants for datetime.fromisoformat().
+    - Converts trailing 'Z' to '+00:00'
+    """
+    s = s.strip()
+    if s.endswith("Z"):
+        return s[:-1] + "+00:00"
+    return s
+
+
+def parse_iso_dt(s: str) -> datetime:
+    """
+    Parse ISO datetime string into timezone-aware datetime (UTC).
+    Returns DT_MIN on failure.
+    """
+    try:
+        dt = datetime.fromisoformat(normalize_iso_ts(s))
+    except Exception:
+        return DT_MIN
+
+    if dt.tzinfo is None:
+        # If upstream ever gives a naive timestamp, assume UTC
+        dt = dt.replace(tzinfo=timezone.utc)
+
+    return dt.astimezone(timezone.utc)
+
+
+def record_fingerprint(record: dict[str, Any]) -> str:
+    """Short content hash of a record: last_modified_timestamp plus all fields."""
+    fields = record.get("fields") or {}
+    lm = str(fields.get("last_modified_timestamp", "")) if isinstance(fields, dict) else ""
+    body = json.dumps(fields, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(f"{lm}|{body}".encode(), digest_size=8).hexdigest()
+
+
+class FingerprintStore:
+    """
+    recordid -> (last_modified epoch seconds, fingerprint) for records already sent to Bronze.
+
+    Persisted as gzip-compressed TSV (`recordid\tlast_modified\tfingerprint`).
+    Entries whose last_modified falls before the next run's effective start are pruned
+    on save: those records can only come back if they change, and then their
+    last_modified (and fingerprint) changes too.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, tuple[int, str]] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "FingerprintStore":
+        store = cls(path)
+        if not path.exists():
+            return store
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    rid, lm, fp = line.rstrip("\n").split("\t")
+                    store.entries[rid] = (int(lm), fp)
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"Fingerprint file is corrupt: {path} (delete it to re-ingest everything)") from e
+        return store
+
+    def is_unchanged(self, record: dict[str, Any]) -> bool:
+        """Return True if the record matches what was last stored; otherwise remember it and return False."""
+        rid = record.get("recordid")
+        if not rid:
+            return False
+        fp = record_fingerprint(record)
+        prev = self.entries.get(rid)
+        if prev is not None and prev[1] == fp:
+            return True
+        fields = record.get("fields") or {}
+        lm = parse_iso_dt(str(fields.get("last_modified_timestamp", ""))) if isinstance(fields, dict) else DT_MIN
+        self.entries[rid] = (int(lm.timestamp()) if lm != DT_MIN else 0, fp)
+        return False
+
+    def save(self, keep_since: datetime) -> None:
+        cutoff = int(keep_since.timestamp())
+        self.entries = {rid: e for rid, e in self.entries.items() if e[0] >= cutoff}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for rid, (lm, fp) in self.entries.items():
+                f.write(f"{rid}\t{lm}\t{fp}\n")
+        tmp_path.replace(self.path)
+
+
+class BronzeWriter:
+    """
+    Stream records into a Bronze NDJSON file (one API record per line), page by page.
+
+    The file is written under a `.partial` name and renamed into place on a clean
+    close (and removed on a failed one), so readers never pick up a half-written run. The record count and the
+    max `last_modified_timestamp` are tracked while writing, so the watermark needs
+    no second pass over the data.
+
+    With a FingerprintStore, records unchanged since the last run are skipped
+    (they still count towards the watermark). With `keep_records`, the records written
+    are also kept in `written` so an in-process caller can use them without re-reading the file.
+    """
+
+    def __init__(self, path: Path, fingerprints: FingerprintStore | None = None, keep_records: bool = False) -> None:
+        self.path = path
+        self.partial_path = path.with_name(path.name + ".partial")
+        self.fingerprints = fingerprints
+        self.records_seen = 0
+        self.records_written = 0
+        self.records_unchanged = 0
+        self.max_last_modified = DT_MIN
+        self.written: list[dict[str, Any]] | None = [] if keep_records else None
+        self._fh: IO[str] | None = None
+
+    def __enter__(self) -> Self:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Compression follows the final name; the .partial suffix is only a marker.
+        self._fh = open_text(self.partial_path, "wt", suffix=self.path.suffix)
+        return self
+
+    def write_records(self, records: list[dict[str, Any]]) -> None:
+        lines = []
+        for r in records:
+            fields = r.get("fields", {})
+            if isinstance(fields, dict) and fields.get("last_modified_timestamp"):
+                ts = parse_iso_dt(str(fields["last_modified_timestamp"]))
+                self.max_last_modified = max(self.max_last_modified, ts)
+            if self.fingerprints is not None and self.fingerprints.is_unchanged(r):
+                self.records_unchanged += 1
+                continue
+            lines.append(json.dumps(r, ensure_ascii=False))
+            if self.written is not None:
+                self.written.append(r)
+        if lines:
+            self._fh.write("\n".join(lines) + "\n")
+        self.records_seen += len(records)
+        self.records_written += len(lines)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._fh.close()
+        if exc_type is None:
+            self.partial_path.replace(self.path)
+        else:
+            # A failed run leaves nothing behind; the next run starts the file over
+            self.partial_path.unlink(missing_ok=True)
+
+
+class _JsonTextStream:
+    """
+    Pull-style JSON reader over text chunks. Only the value currently being
+    decoded is buffered, so memory stays flat no matter how large the document is.
+    """
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._decoder = json.JSONDecoder()
+        self._it = iter(chunks)
+        self._buf = ""
+        self._pos = 0
+        self._exhausted = False
+
+    def _fill(self) -> bool:
+        for chunk in self._it:
+            if chunk:
+                self._buf = self._buf[self._pos:] + chunk
+                self._pos = 0
+                return True
+        self._exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._exhausted or not self._fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Expected {ch!r} in JSON, got {got or 'end of input'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value at the current position."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._exhausted or not self._fill():
+                    raise
+                continue
+            # A scalar ending exactly at the buffer edge may be cut short; read on to be sure.
+            if end == len(self._buf) and not self._exhausted and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the elements of the array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            nxt = self.peek()
+            if nxt == "]":
+                self._pos += 1
+                return
+            if nxt != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {nxt or 'end of input'!r}")
+            self._pos += 1
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Incrementally decode a top-level JSON array from a stream of text chunks,
+    yielding one element at a time.
+    """
+    stream = _JsonTextStream(chunks)
+    if stream.peek() != "[":
+        raise ValueError("Expected a JSON array")
+    yield from stream.iter_array()
+
+
+def iter_json_records(chunks: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """
+    Stream records out of either supported JSON shape:
+    1) a top-level list of records
+    2) an object with a "records" list (API payload); other keys are skipped
+
+    Non-dict elements are dropped. Raises ValueError on malformed input.
+    """
+    stream = _JsonTextStream(chunks)
+    first = stream.peek()
+    if first == "[":
+        yield from (r for r in stream.iter_array() if isinstance(r, dict))
+        return
+    if first != "{":
+        raise ValueError("Unexpected JSON shape (expected list or dict)")
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key == "records":
+            if stream.peek() != "[":
+                raise ValueError('"records" is not a list')
+            yield from (r for r in stream.iter_array() if isinstance(r, dict))
+        else:
+            stream.value()
+        nxt = stream.peek()
+        if nxt == "}":
+            return
+        if nxt != ",":
+            raise ValueError(f"Expected ',' or '}}' in JSON object, got {nxt or 'end of input'!r}")
+        stream.expect(",")
+
@@ -1,53 +1,117 @@
 import argparse
-import json
 from collections import Counter
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
+from ..metrics import RunMetrics, add_metrics_arguments, file_size, instrumented
+from .bronze_io import find_bronze_files
+from .reader import read_records
+from .sketches import HyperLogLog, SpaceSaving
+
+# Only recordids (and, for the example, last-modified timestamps) are looked at
+DUPLICATE_FIELDS = ("last_modified_timestamp",)
+
+
+def iter_bronze_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream a Bronze file's records (any format, see reader.iter_records), projected to DUPLICATE_FIELDS."""
+    return read_records(path, "Bronze", DUPLICATE_FIELDS)
+
+
+def scan_files(files: list[Path], exact: bool, capacity: int) -> dict[str, Any]:
+    """
+    One streaming pass over several Bronze files.
+
+    Sketch mode keeps fixed memory regardless of input size: a HyperLogLog per file
+    (unique recordids, and overlap with the previous file via |A|+|B|-|A u B|) and a
+    Space-Saving summary for the most repeated recordids. Exact mode uses a Counter
+    and per-file sets instead (fine for small inputs).
+    """
+    per_file = []
+    total = 0
+    overall = Counter() if exact else SpaceSaving(capacity)
+    union = set() if exact else HyperLogLog()
+    prev = None
+    for path in files:
+        ids = set() if exact else HyperLogLog()
+        n = 0
+        for r in iter_bronze_records(path):
+            rid = r.get("recordid")
+            if not rid:
+                continue
+            n += 1
+            ids.add(rid)
+            if exact:
+                overall[rid] += 1
+            else:
+                overall.add(rid)
+        if exact:
+            unique = len(ids)
+            shared = len(ids & prev) if prev is not None else None
+            union |= ids
+        else:
+            unique = min(ids.count(), n)
+            if prev is not None:
+                shared = min(unique, max(0, unique + prev.count() - prev.merge(ids).count()))
+            else:
+                shared = None
+            union = union.merge(ids)
+        per_file.append({"file": path, "records": n, "unique": unique, "shared_with_prev": shared})
+        total += n
+        prev = ids
+
+    if exact:
+        top = [(rid, c, 0) for rid, c in overall.most_common() if c > 1]
+        unique = len(union)
+    else:
+        top = [t for t in overall.top(capacity) if t[1] > 1]
+        unique = union.count()
+    return {"per_file": per_file, "total": total, "unique": unique, "top": top}
+
+
+def print_scan(scan: dict[str, Any], exact: bool, top_n: int, capacity: int) -> None:
+    mode = "exact" if exact else "sketch (estimates)"
+    print(f"Files: {len(scan['per_file'])}  mode: {mode}")
+    print(f"{'records':>9} {'unique':>9} {'shared w/ prev':>15}  file")
+    for f in scan["per_file"]:
+        if f["shared_with_prev"] is None:
+            shared = "-"
+        else:
+            ratio = f["shared_with_prev"] / f["unique"] if f["unique"] else 0.0
+            shared = f"{f['shared_with_prev']} ({ratio:.0%})"
+        print(f"{f['records']:>9} {f['unique']:>9} {shared:>15}  {f['file']}")
+
+    total, unique = scan["total"], scan["unique"]
+    print("\nTotal records with recordid:", total)
+    print("Unique recordids:", unique)
+    print("Duplicate records (total - unique):", max(0, total - unique))
 
-def load_bronze_records(path: Path) -> list[dict[str, Any]]:
-    try:
-        raw = path.read_text(encoding="utf-8")
-    except FileNotFoundError as e:
-        raise SystemExit(f"Bronze file not found: {path}") from e
-
-    try:
-        payload = json.loads(raw)
-    except json.JSONDecodeError as e:
-        raise SystemExit(f"Bronze file is not valid JSON: {path}") from e
-
-    # Support both shapes:
-    # 1) dict with "records"
-    if isinstance(payload, dict):
-        records = payload.get("records", [])
-        if not isinstance(records, list):
-            raise SystemExit('Unexpected payload: "records" is not a list.')
-        return [r for r in records if isinstance(r, dict)]
-
-    # 2) list of records
-    if isinstance(payload, list):
-        return [r for r in payload if isinstance(r, dict)]
-
-    raise SystemExit("Unexpected bronze JSON shape (expected dict or list).")
-
-
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Check duplicate recordid values in a Bronze JSON file.")
-    parser.add_argument("--file", type=Path, required=True, help="Path to a Bronze JSON file.")
-    parser.add_argument("--top", type=int, default=10, help="Show top N duplicate recordids (default: 10).")
-    args = parser.parse_args()
-
-    records = load_bronze_records(args.file)
-
-    recordids = [r.get("recordid") for r in records if r.get("recordid")]
-    counts = Counter(recordids)
-
-    total = len(recordids)
+    if not scan["top"]:
+        print("\nNo duplicate recordids found.")
+        return
+    print(f"\nTop {min(top_n, len(scan['top']))} duplicates:")
+    for rid, c, err in scan["top"][:top_n]:
+        bound = f"  (+/- {err})" if err else ""
+        print(f"  {rid}  ->  {c} occurrences{bound}")
+    if not exact:
+        print(f"\nCounts are upper bounds; error is at most total / capacity = {total / capacity:.1f}.")
+        print("Use --exact for exact counts on small inputs.")
+
+
+def check_file(path: Path, top_n: int, metrics: RunMetrics) -> None:
+    # Stream the file: only the per-recordid counts are kept in memory.
+    with metrics.phase("count") as phase:
+        counts = Counter(r.get("recordid") for r in iter_bronze_records(path) if r.get("recordid"))
+        metrics.add_read(file_size(path))
+        phase["records"] = sum(counts.values())
+
+    total = sum(counts.values())
     unique = len(counts)
     dupes = [(rid, c) for rid, c in counts.items() if c > 1]
     dupes_sorted = sorted(dupes, key=lambda x: x[1], reverse=True)
+    metrics.add_stats("duplicates", {"total": total, "unique": unique, "duplicate_recordids": len(dupes_sorted)})
 
-    print("File:", args.file)
+    print("File:", path)
     print("Total records with recordid:", total)
     print("Unique recordids:", unique)
     print("Duplicate recordids:", len(dupes_sorted))
@@ -56,22 +120,58 @@ def main() -> None:
         print("\nNo duplicate recordids found.")
         return
 
-    print(f"\nTop {min(args.top, len(dupes_sorted))} duplicates:")
-    for rid, c in dupes_sorted[: args.top]:
+    print(f"\nTop {min(top_n, len(dupes_sorted))} duplicates:")
+    for rid, c in dupes_sorted[:top_n]:
         print(f"  {rid}  ->  {c} occurrences")
 
-    # Show timestamps for the worst offender (most duplicated)
+    # Show timestamps for the worst offender (most duplicated); second streaming pass
     sample_rid, _ = dupes_sorted[0]
     ts = []
-    for r in records:
-        if r.get("recordid") == sample_rid:
-            fields = r.get("fields", {})
-            if isinstance(fields, dict):
-                ts.append(fields.get("last_modified_timestamp"))
+    with metrics.phase("example") as phase:
+        for r in iter_bronze_records(path):
+            if r.get("recordid") == sample_rid:
+                fields = r.get("fields", {})
+                if isinstance(fields, dict):
+                    ts.append(fields.get("last_modified_timestamp"))
+        metrics.add_read(file_size(path))
+        phase["records"] = total
 
     print("\nExample duplicated recordid:", sample_rid)
     print("Its last_modified_timestamps:", ts)
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check duplicate recordid values in Bronze files.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", type=Path, help="Path to a Bronze JSON or NDJSON file (.gz/.zst compressed is fine).")
+    source.add_argument("--dir", type=Path, help="Scan every Bronze file under this directory (e.g. data/bronze).")
+    parser.add_argument("--pattern", default="*", help="Filename glob used with --dir (default: *).")
+    parser.add_argument("--top", type=int, default=10, help="Show top N duplicate recordids (default: 10).")
+    parser.add_argument("--exact", action="store_true", help="With --dir: exact counts instead of sketches (memory grows with input).")
+    parser.add_argument("--capacity", type=int, default=10_000, help="Space-Saving counters for the top-k sketch (default: 10000).")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumented("check_duplicates", args) as metrics:
+        if args.file is not None:
+            check_file(args.file, args.top, metrics)
+            return
+        files = find_bronze_files(args.dir, args.pattern)
+        if not files:
+            raise SystemExit(f"No Bronze files matching {args.pattern!r} under {args.dir}")
+        with metrics.phase("scan") as phase:
+            scan = scan_files(files, args.exact, args.capacity)
+            metrics.add_read(sum(file_size(f) for f in files))
+            phase["records"] = scan["total"]
+        metrics.add_stats("duplicates", {
+            "files": len(files),
+            "total": scan["total"],
+            "unique": scan["unique"],
+            "duplicate_records": max(0, scan["total"] - scan["unique"]),
+            "mode": "exact" if args.exact else "sketch",
+        })
+        print_scan(scan, args.exact, args.top, args.capacity)
+
+
 if __name__ == "__main__":
     main()
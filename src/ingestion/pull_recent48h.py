@@ -1,18 +1,38 @@
 import argparse
 import json
 import os
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from ..metrics import RunMetrics, add_metrics_arguments, file_size, instrumented
+from .bronze_io import (
+    COMPRESSION_SUFFIXES,
+    DEFAULT_COMPRESSION,
+    DT_MIN,
+    BronzeWriter,
+    FingerprintStore,
+    bronze_partition_dir,
+    iter_json_array,
+    parse_iso_dt,
+)
 
 
 API_PATH = "/api/records/1.0/search/"
+EXPORT_API_PATH = "/api/records/1.0/download/"
 STATE_PATH = Path("config/state.json")
+FINGERPRINTS_PATH = Path("config/fingerprints.tsv.gz")
 BRONZE_DIR = Path("data/bronze")
 CHUNK_SIZE_HOURS = 6
+ODS_MAX_OFFSET = 10000
 
 
 def utc_now() -> datetime:
@@ -23,34 +43,6 @@ def utc_ts_compact(dt: datetime) -> str:
     return dt.strftime("%Y%m%dT%H%M%SZ")
 
 
-def normalize_iso_ts(s: str) -> str:
-    """
-    Normalize common API timestamp variants for datetime.fromisoformat().
-    - Converts trailing 'Z' to '+00:00'
-    """
-    s = s.strip()
-    if s.endswith("Z"):
-        return s[:-1] + "+00:00"
-    return s
-
-
-def parse_iso_dt(s: str) -> datetime:
-    """
-    Parse ISO datetime string into timezone-aware datetime (UTC).
-    Returns DT_MIN on failure.
-    """
-    try:
-        dt = datetime.fromisoformat(normalize_iso_ts(s))
-    except Exception:
-        return datetime.min.replace(tzinfo=timezone.utc)
-
-    if dt.tzinfo is None:
-        # If upstream ever gives a naive timestamp, assume UTC
-        dt = dt.replace(tzinfo=timezone.utc)
-
-    return dt.astimezone(timezone.utc)
-
-
 def load_state(path: Path) -> dict[str, Any]:
     if not path.exists():
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -74,8 +66,24 @@ def save_state(path: Path, state: dict[str, Any]) -> None:
     path.write_text(json.dumps(state, indent=2), encoding="utf-8")
 
 
-def build_url(base_url: str) -> str:
-    return f"{base_url.rstrip('/')}{API_PATH}"
+def build_url(base_url: str, api_path: str = API_PATH) -> str:
+    return f"{base_url.rstrip('/')}{api_path}"
+
+
+def build_session(pool_size: int) -> requests.Session:
+    """
+    Create a Session backed by a keep-alive connection pool.
+    The pool is sized to the worker count so concurrent requests reuse connections.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def window_query(start_iso: str, end_iso: str) -> str:
+    return f'last_modified_timestamp >= "{start_iso}" AND last_modified_timestamp < "{end_iso}"'
 
 
 def fetch_page(
@@ -86,18 +94,18 @@ def fetch_page(
     start: int,
     page_size: int,
     timeout_s: int,
+    session: requests.Session | None = None,
 ) -> dict[str, Any]:
-    q = f'last_modified_timestamp >= "{chunk_start_iso}" AND last_modified_timestamp < "{chunk_end_iso}"'
     params = {
         "dataset": dataset,
-        "q": q,
+        "q": window_query(chunk_start_iso, chunk_end_iso),
         "rows": page_size,
         "start": start,
         "sort": "-last_modified_timestamp",
     }
 
     try:
-        resp = requests.get(url, params=params, timeout=timeout_s)
+        resp = (session or requests).get(url, params=params, timeout=timeout_s)
         resp.raise_for_status()
     except requests.RequestException as e:
         raise SystemExit(f"HTTP request failed: {e}") from e
@@ -113,7 +121,264 @@ def fetch_page(
     return payload
 
 
-def main() -> None:
+def stream_export(
+    url: str,
+    dataset: str,
+    range_start_iso: str,
+    range_end_iso: str,
+    timeout_s: int,
+    session: requests.Session,
+    sink: Callable[[list[dict[str, Any]]], None],
+    batch_size: int,
+) -> int:
+    """
+    Stream a whole time range from the bulk download endpoint in one response.
+
+    The body is a JSON array of records in the same shape as the search API;
+    it is decoded incrementally and handed to `sink` in batches of `batch_size`,
+    so neither the offset cap nor the response size matters.
+
+    Returns the number of records handed to `sink`.
+    """
+    params = {
+        "dataset": dataset,
+        "q": window_query(range_start_iso, range_end_iso),
+        "format": "json",
+        "timezone": "UTC",
+    }
+
+    def batches() -> Iterator[list[dict[str, Any]]]:
+        with session.get(url, params=params, timeout=timeout_s, stream=True) as resp:
+            resp.raise_for_status()
+            resp.encoding = "utf-8"
+            batch: list[dict[str, Any]] = []
+            for record in iter_json_array(resp.iter_content(chunk_size=64 * 1024, decode_unicode=True)):
+                if not isinstance(record, dict):
+                    continue
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    # Only reading and decoding the response is guarded: errors raised by `sink` (writing Bronze) pass through as they are
+    total = 0
+    with closing(batches()) as response_batches:
+        while True:
+            try:
+                batch = next(response_batches, None)
+            except requests.RequestException as e:
+                raise SystemExit(f"HTTP request failed: {e}") from e
+            except ValueError as e:
+                raise SystemExit(f"Export response was not a valid JSON array: {e}") from e
+            if batch is None:
+                return total
+            sink(batch)
+            total += len(batch)
+            print(f"  Streamed {total} records")
+
+
+def chunk_windows(range_start_dt: datetime, range_end_dt: datetime, hours: int) -> list[tuple[datetime, datetime]]:
+    """Split [range_start_dt, range_end_dt) into consecutive windows of `hours` each."""
+    windows: list[tuple[datetime, datetime]] = []
+    chunk_start_dt = range_start_dt
+    while chunk_start_dt < range_end_dt:
+        chunk_end_dt = min(chunk_start_dt + timedelta(hours=hours), range_end_dt)
+        windows.append((chunk_start_dt, chunk_end_dt))
+        chunk_start_dt = chunk_end_dt
+    return windows
+
+
+def iso(dt: datetime) -> str:
+    return dt.replace(microsecond=0).isoformat()
+
+
+def page_records(payload: dict[str, Any]) -> tuple[list[dict[str, Any]], int]:
+    """Return (records, nhits) from a search payload, validating the shape."""
+    records = payload.get("records", [])
+    if not isinstance(records, list):
+        raise SystemExit("Unexpected payload: 'records' is not a list.")
+
+    nhits = payload.get("nhits", 0)
+    if not isinstance(nhits, int):
+        nhits = 0
+    return records, nhits
+
+
+def max_window_rows(page_size: int) -> int:
+    """Most rows a single window can return before paging runs into the offset cap."""
+    return (ODS_MAX_OFFSET // page_size) * page_size
+
+
+def page_starts(nhits: int, page_size: int) -> list[int]:
+    """Offsets needed to cover `nhits` rows, limited to what the API allows to page through."""
+    return [start for start in range(0, nhits, page_size) if start + page_size <= ODS_MAX_OFFSET]
+
+
+def plan_windows(
+    probe: Callable[[datetime, datetime], int],
+    windows: list[tuple[datetime, datetime]],
+    page_size: int,
+    executor: ThreadPoolExecutor,
+) -> list[tuple[datetime, datetime, int]]:
+    """
+    Partition the time range into the fewest windows that can each be paged in full.
+
+    1. Probe nhits (rows=0) for every window, level by level, in parallel
+    2. Bisect any window whose nhits exceeds the offset cap and probe the halves
+    3. Merge adjacent windows while their combined nhits still fits under the cap
+
+    Returns [(start_dt, end_dt, nhits)] in chronological order.
+    """
+    cap = max_window_rows(page_size)
+    done: list[tuple[datetime, datetime, int]] = []
+    pending = list(windows)
+
+    while pending:
+        counts = list(executor.map(lambda w: probe(w[0], w[1]), pending))
+        next_pending: list[tuple[datetime, datetime]] = []
+        for (start_dt, end_dt), nhits in zip(pending, counts):
+            if nhits <= cap:
+                done.append((start_dt, end_dt, nhits))
+                continue
+
+            if end_dt - start_dt <= timedelta(seconds=1):
+                raise SystemExit(
+                    f"Window {iso(start_dt)} to {iso(end_dt)} has {nhits} records (> {cap}) and cannot be split further."
+                )
+
+            mid_dt = (start_dt + (end_dt - start_dt) / 2).replace(microsecond=0)
+            print(f"  Split {iso(start_dt)} to {iso(end_dt)} ({nhits} > {cap}) at {iso(mid_dt)}")
+            next_pending.extend([(start_dt, mid_dt), (mid_dt, end_dt)])
+        pending = next_pending
+
+    done.sort(key=lambda w: w[0])
+
+    merged: list[tuple[datetime, datetime, int]] = []
+    for start_dt, end_dt, nhits in done:
+        if merged and merged[-1][2] + nhits <= cap:
+            prev_start_dt, _, prev_nhits = merged[-1]
+            merged[-1] = (prev_start_dt, end_dt, prev_nhits + nhits)
+        else:
+            merged.append((start_dt, end_dt, nhits))
+    return merged
+
+
+def print_plan(plan: list[tuple[datetime, datetime, int]], page_size: int) -> None:
+    print("\n--- Window plan ---")
+    for i, (start_dt, end_dt, nhits) in enumerate(plan):
+        print(f"  [{i}] {iso(start_dt)} to {iso(end_dt)}: {nhits} records, {len(page_starts(nhits, page_size))} page(s)")
+    print(f"  Total: {sum(w[2] for w in plan)} records in {len(plan)} window(s), "
+          f"{sum(len(page_starts(w[2], page_size)) for w in plan)} page request(s)")
+
+
+def fetch_window(
+    fetch: Callable[[datetime, datetime, int], dict[str, Any]],
+    probe: Callable[[datetime, datetime], int],
+    start_dt: datetime,
+    end_dt: datetime,
+    page_size: int,
+    executor: ThreadPoolExecutor,
+    sink: Callable[[list[dict[str, Any]]], None],
+) -> int:
+    """
+    Page through one planned window, handing each page to `sink` as it arrives.
+    If the window grew past the offset cap since it was probed, re-plan it and fetch the pieces
+    (pages already handed over are re-sent; Silver dedupes them).
+
+    Returns the number of records handed to `sink`.
+    """
+    print(f"\nFetching chunk: {iso(start_dt)} to {iso(end_dt)}")
+    chunk_total = 0
+    start = 0
+    chunk_page = 0
+
+    #Fetch pages within the chunk
+    while start + page_size <= ODS_MAX_OFFSET:
+        records, nhits = page_records(fetch(start_dt, end_dt, start))
+        if nhits > max_window_rows(page_size):
+            print(f"  Chunk now has {nhits} records; re-planning it")
+            replanned = plan_windows(probe, [(start_dt, end_dt)], page_size, executor)
+            print_plan(replanned, page_size)
+            for sub_start_dt, sub_end_dt, _ in replanned:
+                chunk_total += fetch_window(fetch, probe, sub_start_dt, sub_end_dt, page_size, executor, sink)
+            return chunk_total
+
+        sink(records)
+        chunk_total += len(records)
+        print(f"  Page {chunk_page}: pulled {len(records)} records. Chunk total: {chunk_total} / {nhits}")
+        chunk_page += 1
+        start += page_size
+        if not records or (nhits and chunk_total >= nhits):
+            break
+
+    return chunk_total
+
+
+def fetch_windows_concurrent(
+    fetch: Callable[[datetime, datetime, int], dict[str, Any]],
+    probe: Callable[[datetime, datetime], int],
+    plan: list[tuple[datetime, datetime, int]],
+    page_size: int,
+    executor: ThreadPoolExecutor,
+    workers: int,
+    sink: Callable[[list[dict[str, Any]]], None],
+) -> int:
+    """
+    Fetch the pages of every planned window in parallel, handing them to `sink` in order.
+
+    nhits is already known from the plan, so offsets are submitted without waiting
+    for earlier pages. At most 2 * workers pages are in flight at once, which keeps
+    memory bounded, and results are consumed in (window, page) order so the output
+    matches the serial path. A window whose nhits changed since planning is
+    re-fetched serially.
+
+    Returns the number of records handed to `sink`.
+    """
+    tasks = [
+        (window_idx, chunk_page, start)
+        for window_idx, (_, _, nhits) in enumerate(plan)
+        for chunk_page, start in enumerate(page_starts(nhits, page_size))
+    ]
+    in_flight: deque[tuple[int, int, Future]] = deque()
+    next_task = 0
+    total = 0
+    chunk_total = 0
+    changed_windows: set[int] = set()
+
+    while next_task < len(tasks) or in_flight:
+        while next_task < len(tasks) and len(in_flight) < 2 * workers:
+            window_idx, chunk_page, start = tasks[next_task]
+            start_dt, end_dt, _ = plan[window_idx]
+            in_flight.append((window_idx, chunk_page, executor.submit(fetch, start_dt, end_dt, start)))
+            next_task += 1
+
+        window_idx, chunk_page, future = in_flight.popleft()
+        start_dt, end_dt, planned_nhits = plan[window_idx]
+        records, nhits = page_records(future.result())
+        last_page = chunk_page == len(page_starts(planned_nhits, page_size)) - 1
+
+        if chunk_page == 0:
+            print(f"\nFetched chunk: {iso(start_dt)} to {iso(end_dt)}")
+            chunk_total = 0
+        if nhits != planned_nhits:
+            changed_windows.add(window_idx)
+
+        if window_idx not in changed_windows:
+            sink(records)
+            chunk_total += len(records)
+            total += len(records)
+            print(f"  Page {chunk_page}: pulled {len(records)} records. Chunk total: {chunk_total} / {nhits}")
+
+        if last_page and window_idx in changed_windows:
+            print(f"  Chunk {iso(start_dt)} to {iso(end_dt)} changed since planning; re-fetching serially")
+            total += fetch_window(fetch, probe, start_dt, end_dt, page_size, executor, sink)
+
+    return total
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Incrementally pull recent 3-1-1 records (last_modified_timestamp) into Bronze using a watermark + lookback."
     )
@@ -121,10 +386,40 @@ def main() -> None:
     parser.add_argument("--lookback-hours", type=int, default=24, help="Safety lookback to catch late updates (default: 24).")
     parser.add_argument("--page-size", type=int, default=1000, help="Rows per API page (default: 1000). Max is typically 1000.")
     parser.add_argument("--timeout", type=int, default=30, help="HTTP timeout seconds (default: 30).")
-    args = parser.parse_args()
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent HTTP workers; 1 fetches serially (default: 1).")
+    parser.add_argument("--base-url", type=str, default=None, help="Override ODS_BASE_URL (e.g. a local stub server).")
+    parser.add_argument(
+        "--mode",
+        choices=["search", "export"],
+        default="search",
+        help="search: paged search API per window; export: one streamed response from the bulk download endpoint (default: search).",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=sorted(COMPRESSION_SUFFIXES),
+        default=DEFAULT_COMPRESSION,
+        help=f"Bronze segment compression (default: {DEFAULT_COMPRESSION}; zstd needs Python 3.14+).",
+    )
+    parser.add_argument(
+        "--no-skip-unchanged",
+        action="store_true",
+        help=f"Write every pulled record, even if unchanged since the last run (ignores {FINGERPRINTS_PATH}).",
+    )
+    add_metrics_arguments(parser)
+    return parser
+
+
+def run(args: argparse.Namespace, keep_records: bool = False, metrics: RunMetrics | None = None) -> dict[str, Any]:
+    """
+    Pull one incremental window into Bronze.
 
+    Returns {"bronze_file": path or None, "records_pulled", "records_written", "records"}; "records"
+    holds the written records when `keep_records` is set (for the in-process pipeline), else None.
+    Phases, HTTP requests and counts are recorded in `metrics`.
+    """
+    metrics = metrics or RunMetrics("pull_recent48h")
     load_dotenv()
-    base_url = os.getenv("ODS_BASE_URL", "").strip()
+    base_url = (args.base_url or os.getenv("ODS_BASE_URL", "")).strip()
     dataset = os.getenv("ODS_DATASET", "").strip()
 
     if not base_url or not dataset:
@@ -138,7 +433,7 @@ def main() -> None:
 
     if last_watermark:
         lw_dt = parse_iso_dt(str(last_watermark))
-        if lw_dt == datetime.min.replace(tzinfo=timezone.utc):
+        if lw_dt == DT_MIN:
             raise SystemExit(f"Invalid last_watermark in state.json: {last_watermark}")
         effective_start = lw_dt - timedelta(hours=args.lookback_hours)
     else:
@@ -151,90 +446,107 @@ def main() -> None:
 
     url = build_url(base_url)
 
-    all_records: list[dict[str, Any]] = []
-    start = 0
-   
-    range_start_dt = effective_start
-    range_end_dt = now
-    chunk_start_dt = range_start_dt
-
-    while chunk_start_dt < range_end_dt:
-
-        chunk_end_dt = min(chunk_start_dt + timedelta(hours=CHUNK_SIZE_HOURS), now)
-        chunk_start_iso = chunk_start_dt.replace(microsecond=0).isoformat()
-        chunk_end_iso = chunk_end_dt.replace(microsecond=0).isoformat()
-        print(f"\nFetching chunk: {chunk_start_iso} to {chunk_end_iso}")
-        
-
-        chunk_records: list[dict[str, Any]] = []
-        start = 0
-        chunk_page = 0
-
-        #Fetch pages within the chunk
-        while True:
-            if start + args.page_size > 10000:
-                break
-                raise SystemExit("This chunk has >10k records. Reduce CHUNK_SIZE_HOURS (e.g., 6 → 3 → 1).")
-            
-            payload = fetch_page(
-                url=url,
-                dataset=dataset,
-                chunk_start_iso=chunk_start_iso,
-                chunk_end_iso=chunk_end_iso,
-                start=start,
-                page_size=args.page_size,
-                timeout_s=args.timeout,
-            )
-
-            records = payload.get("records", [])
-            if not isinstance(records, list):
-                raise SystemExit("Unexpected payload: 'records' is not a list.")
-
-            nhits = payload.get("nhits", 0)
-            if not isinstance(nhits, int):
-                nhits = 0
-
-            chunk_records.extend(records)
-            
-            print(f"  Page {chunk_page}: pulled {len(records)} records. Chunk total: {len(chunk_records)} / {nhits}")
-            chunk_page += 1
-            start += args.page_size
-            if not records or (nhits and len(chunk_records) >= nhits):
-                break
-
-        all_records.extend(chunk_records)
-        chunk_start_dt = chunk_end_dt
-
-    print(f"\nTotal records pulled across all chunks: {len(all_records)}")
-
-    BRONZE_DIR.mkdir(parents=True, exist_ok=True)
-    out_path = BRONZE_DIR / f"{dataset}__last{args.hours}h__{utc_ts_compact(now)}.json"
-    out_path.write_text(json.dumps(all_records, indent=2), encoding="utf-8")
-    print(f"Saved {len(all_records)} records to: {out_path}")
-
-    # Update watermark based on max last_modified_timestamp present
-    timestamps = []
-    for r in all_records:
-        fields = r.get("fields", {})
-        if isinstance(fields, dict):
-            ts = fields.get("last_modified_timestamp")
-            if ts:
-                timestamps.append(str(ts))
-
-    if not timestamps:
-        print("No last_modified_timestamp found. State not updated.")
-        return
+    def fetch(start_dt: datetime, end_dt: datetime, start: int, rows: int = args.page_size) -> dict[str, Any]:
+        return fetch_page(
+            url=url,
+            dataset=dataset,
+            chunk_start_iso=iso(start_dt),
+            chunk_end_iso=iso(end_dt),
+            start=start,
+            page_size=rows,
+            timeout_s=args.timeout,
+            session=session,
+        )
+
+    def probe(start_dt: datetime, end_dt: datetime) -> int:
+        return page_records(fetch(start_dt, end_dt, 0, rows=0))[1]
+
+    out_dir = bronze_partition_dir(BRONZE_DIR, now)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"{dataset}__last{args.hours}h__{utc_ts_compact(now)}.ndjson{COMPRESSION_SUFFIXES[args.compression]}"
+
+    fingerprints = None if args.no_skip_unchanged else FingerprintStore.load(FINGERPRINTS_PATH)
+    if fingerprints is not None:
+        print(f"Loaded {len(fingerprints.entries)} record fingerprints from {FINGERPRINTS_PATH}")
+
+    session = metrics.instrument(build_session(max(args.workers, 1)))
+    try:
+        with metrics.phase("fetch") as fetch_phase:
+            if args.mode == "export":
+                range_start_iso, range_end_iso = iso(effective_start), iso(now)
+                print(f"\nStreaming export: {range_start_iso} to {range_end_iso}")
+                with BronzeWriter(out_path, fingerprints, keep_records) as writer:
+                    stream_export(
+                        url=build_url(base_url, EXPORT_API_PATH),
+                        dataset=dataset,
+                        range_start_iso=range_start_iso,
+                        range_end_iso=range_end_iso,
+                        timeout_s=args.timeout,
+                        session=session,
+                        sink=writer.write_records,
+                        batch_size=args.page_size,
+                    )
+            else:
+                with ThreadPoolExecutor(max_workers=max(args.workers, 1)) as executor, BronzeWriter(out_path, fingerprints, keep_records) as writer:
+                    with metrics.phase("plan"):
+                        print("\nProbing nhits per window:")
+                        base_windows = chunk_windows(effective_start.replace(microsecond=0), now.replace(microsecond=0), CHUNK_SIZE_HOURS)
+                        plan = plan_windows(probe, base_windows, args.page_size, executor)
+                        print_plan(plan, args.page_size)
+
+                    if args.workers > 1:
+                        fetch_windows_concurrent(fetch, probe, plan, args.page_size, executor, args.workers, writer.write_records)
+                    else:
+                        for start_dt, end_dt, _ in plan:
+                            fetch_window(fetch, probe, start_dt, end_dt, args.page_size, executor, writer.write_records)
+            fetch_phase["records"] = writer.records_seen
+            if writer.records_written:
+                metrics.add_written(file_size(out_path))
+    finally:
+        # Also on failure: run() is called in-process by the pipeline, so pooled connections must not leak
+        session.close()
+
+    print(f"\nTotal records pulled across all chunks: {writer.records_seen}")
+    if fingerprints is not None:
+        print(f"Unchanged since last run (skipped): {writer.records_unchanged}")
+    result = {
+        "bronze_file": out_path if writer.records_written else None,
+        "records_pulled": writer.records_seen,
+        "records_written": writer.records_written,
+        "records": writer.written,
+    }
+    metrics.add_stats("ingest", {
+        "records_pulled": writer.records_seen,
+        "records_written": writer.records_written,
+        "records_unchanged": writer.records_unchanged,
+    })
+    if writer.records_written:
+        print(f"Saved {writer.records_written} records to: {out_path}")
+    else:
+        out_path.unlink()
+        print("No new or changed records. No Bronze file written.")
 
-    max_dt = max((parse_iso_dt(t) for t in timestamps))
-    if max_dt == datetime.min.replace(tzinfo=timezone.utc):
-        print("Could not parse any last_modified_timestamp. State not updated.")
-        return
+    # Update watermark based on max last_modified_timestamp seen while writing
+    if writer.max_last_modified == DT_MIN:
+        print("No parseable last_modified_timestamp found. State not updated.")
+        return result
 
-    new_watermark = max_dt.replace(microsecond=0).isoformat()
+    new_watermark = writer.max_last_modified.replace(microsecond=0).isoformat()
     state["last_watermark"] = new_watermark
     save_state(STATE_PATH, state)
     print("Updated last_watermark to:", new_watermark)
 
+    if fingerprints is not None:
+        fingerprints.save(keep_since=writer.max_last_modified - timedelta(hours=args.lookback_hours))
+        print(f"Saved {len(fingerprints.entries)} record fingerprints to: {FINGERPRINTS_PATH}")
+    return result
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    with instrumented("pull_recent48h", args) as metrics:
+        run(args, metrics=metrics)
+
 
 if __name__ == "__main__":
     main()  
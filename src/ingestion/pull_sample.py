@@ -8,6 +8,8 @@ from typing import Any
 import requests
 from dotenv import load_dotenv
 
+from ..metrics import RunMetrics, add_metrics_arguments, file_size, instrumented
+
 
 API_PATH = "/api/records/1.0/search/"
 
@@ -22,7 +24,13 @@ def build_url(base_url: str) -> str:
     return f"{base}{API_PATH}"
 
 
-def fetch_sample(url: str, dataset: str, rows: int, timeout_s: int = 30) -> dict[str, Any]:
+def fetch_sample(
+    url: str,
+    dataset: str,
+    rows: int,
+    timeout_s: int = 30,
+    session: requests.Session | None = None,
+) -> dict[str, Any]:
     params = {
         "dataset": dataset,
         "rows": rows,
@@ -31,7 +39,7 @@ def fetch_sample(url: str, dataset: str, rows: int, timeout_s: int = 30) -> dict
     }
 
     try:
-        resp = requests.get(url, params=params, timeout=timeout_s)
+        resp = (session or requests).get(url, params=params, timeout=timeout_s)
         resp.raise_for_status()
     except requests.RequestException as e:
         raise SystemExit(f"HTTP request failed: {e}") from e
@@ -52,7 +60,7 @@ def save_bronze_payload(payload: dict[str, Any], dataset: str, rows: int, out_di
     return out_path
 
 
-def main() -> None:
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Pull a small sample from City of Vancouver 3-1-1 dataset via Opendatasoft Search API v1."
     )
@@ -63,8 +71,12 @@ def main() -> None:
         default=Path("data/bronze"),
         help="Output directory for Bronze JSON (default: data/bronze).",
     )
-    args = parser.parse_args()
+    add_metrics_arguments(parser)
+    return parser
+
 
+def run(args: argparse.Namespace, metrics: RunMetrics | None = None) -> None:
+    metrics = metrics or RunMetrics("pull_sample")
     # Load settings from .env
     load_dotenv()
     base_url = os.getenv("ODS_BASE_URL", "").strip()
@@ -74,7 +86,8 @@ def main() -> None:
         raise SystemExit("Missing ODS_BASE_URL or ODS_DATASET in .env")
 
     url = build_url(base_url)
-    payload = fetch_sample(url=url, dataset=dataset, rows=args.rows)
+    with metrics.phase("fetch"), metrics.instrument(requests.Session()) as session:
+        payload = fetch_sample(url=url, dataset=dataset, rows=args.rows, session=session)
 
     # Quick shape checks (this script is for schema inspection)
     top_keys = sorted(payload.keys())
@@ -84,7 +97,10 @@ def main() -> None:
     if not isinstance(records, list):
         raise SystemExit("Unexpected payload shape: 'records' is not a list.")
 
-    out_path = save_bronze_payload(payload=payload, dataset=dataset, rows=args.rows, out_dir=args.out_dir)
+    with metrics.phase("write") as phase:
+        out_path = save_bronze_payload(payload=payload, dataset=dataset, rows=args.rows, out_dir=args.out_dir)
+        metrics.add_written(file_size(out_path))
+        phase["records"] = len(records)
 
     print(f"Saved {len(records)} records to: {out_path}")
 
@@ -104,5 +120,11 @@ def main() -> None:
             print("First record is not a dict (unexpected).")
 
 
+def main() -> None:
+    args = build_parser().parse_args()
+    with instrumented("pull_sample", args) as metrics:
+        run(args, metrics)
+
+
 if __name__ == "__main__":
     main()
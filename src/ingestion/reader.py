@@ -0,0 +1,227 @@
+import codecs
+import gzip
+import json
+import mmap
+import re
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+from .bronze_io import iter_json_records, zstd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+UTF8_BOM = codecs.BOM_UTF8
+# JSON documents are streamed a record at a time so memory stays flat; only small uncompressed
+# ones (e.g. a Silver week partition) are copied out and decoded in one call
+WHOLE_DOCUMENT_MAX_BYTES = 4 * 2**20
+READ_CHUNK = 1024 * 1024
+_NON_SPACE = re.compile(rb"[^ \t\r\n]")
+
+
+def _decoders() -> dict[str, Callable[[bytes], Any]]:
+    """Available JSON decoders, fastest first. All take bytes."""
+    decoders: dict[str, Callable[[bytes], Any]] = {}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    if simdjson is not None:
+        decoders["simdjson"] = simdjson.loads
+    decoders["json"] = json.loads
+    return decoders
+
+
+DECODERS = _decoders()
+# The decoder used unless a caller asks for another one
+JSON_DECODER = next(iter(DECODERS))
+loads = DECODERS[JSON_DECODER]
+
+
+def get_decoder(name: str | None = None) -> Callable[[bytes], Any]:
+    if name is None:
+        return loads
+    if name not in DECODERS:
+        raise SystemExit(f"JSON decoder {name!r} is not available (installed: {', '.join(DECODERS)})")
+    return DECODERS[name]
+
+
+def project(record: dict[str, Any], fields: Iterable[str]) -> dict[str, Any]:
+    """
+    The record with only `recordid` and the listed keys of "fields". Keys missing from
+    the record stay missing, so "missing" and "empty" values are still told apart.
+    """
+    out = {"recordid": record["recordid"]} if "recordid" in record else {}
+    source = record.get("fields")
+    if isinstance(source, dict):
+        out["fields"] = {k: source[k] for k in fields if k in source}
+    elif "fields" in record:
+        out["fields"] = source
+    return out
+
+
+def detect_compression(head: bytes) -> str:
+    """Compression of a file from its first bytes: "gzip", "zstd" or "none"."""
+    if head.startswith(GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return "none"
+
+
+@contextmanager
+def open_source(path: Path) -> Iterator[tuple[str, mmap.mmap | IO[bytes] | None]]:
+    """
+    Open a record file for reading as bytes: ("none", mmap) for an uncompressed file,
+    ("gzip" | "zstd", decompressing binary stream) otherwise, ("none", None) when empty.
+    Compression is detected from the content, not the suffix.
+    """
+    with open(path, "rb") as f:
+        compression = detect_compression(f.read(4))
+        f.seek(0)
+        if compression == "gzip":
+            with gzip.open(f, "rb") as stream:
+                yield compression, stream
+        elif compression == "zstd":
+            if zstd is None:
+                raise SystemExit(f"Reading {path} needs zstd support (Python 3.14+ compression.zstd).")
+            with zstd.open(f, "rb") as stream:
+                yield compression, stream
+        elif f.seek(0, 2) == 0:
+            yield compression, None  # an empty file cannot be mapped
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield compression, mm
+
+
+def _document_records(doc: Any) -> Iterator[dict[str, Any]]:
+    """Records of a decoded JSON document: a list of records, or an object with a "records" list."""
+    match doc:
+        case list():
+            records = doc
+        case {"records": list() as records}:
+            pass
+        case {"records": _}:
+            raise ValueError('"records" is not a list')
+        case dict():
+            records = []
+        case _:
+            raise ValueError("Unexpected JSON shape (expected list or dict)")
+    yield from (r for r in records if isinstance(r, dict))
+
+
+def _text_chunks(head: list[bytes], source: mmap.mmap | IO[bytes]) -> Iterator[str]:
+    """The lines already read, then the rest of `source`, as UTF-8 text chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for line in head:
+        yield decoder.decode(line)
+    for block in iter(lambda: source.read(READ_CHUNK), b""):
+        yield decoder.decode(block)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_records(
+    path: Path,
+    fields: Iterable[str] | None = None,
+    decoder: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream records from a Bronze or Silver file, whatever its format:
+    NDJSON, a JSON list, or a JSON object with a "records" list, optionally gzip/zstd
+    compressed. The format and compression are detected from the content.
+
+    Uncompressed files are memory-mapped. NDJSON lines, and uncompressed JSON documents
+    of at most WHOLE_DOCUMENT_MAX_BYTES, are decoded with the fastest decoder installed
+    (orjson, simdjson, else the standard library; `decoder` picks one by name); any other
+    JSON document is streamed one record at a time, so memory does not grow with the file.
+
+    With `fields`, each record is cut down to its recordid and those keys of "fields"
+    (see project). Raises ValueError on malformed JSON.
+    """
+    decode = get_decoder(decoder)
+    keep = None if fields is None else tuple(fields)
+    with open_source(path) as (compression, source):
+        if source is None:
+            return
+        # The first non-blank line tells the formats apart: one complete object is NDJSON
+        head: list[bytes] = []
+        line_no = 0
+        first = b""
+        for line in iter(source.readline, b""):
+            line_no += 1
+            if line_no == 1:
+                line = line.removeprefix(UTF8_BOM)
+            head.append(line)
+            match = _NON_SPACE.search(line)
+            if match:
+                first = line[match.start():match.start() + 1]
+                break
+        if not first:
+            return
+
+        if first not in (b"[", b"{"):
+            raise ValueError("Unexpected JSON shape (expected list or dict)")
+
+        value: Any = None
+        if first == b"{":
+            try:
+                value = decode(head[-1])
+            except ValueError:
+                value = None  # an object spread over several lines: a JSON document
+        if isinstance(value, dict):
+            records: Iterable[dict[str, Any]] = _ndjson_records(value, source, line_no, decode)
+        elif compression == "none" and len(source) <= WHOLE_DOCUMENT_MAX_BYTES:
+            data = source[:]
+            records = _document_records(decode(data.removeprefix(UTF8_BOM)))
+        else:
+            records = iter_json_records(_text_chunks(head, source))
+
+        if keep is None:
+            yield from records
+        else:
+            for r in records:
+                yield project(r, keep)
+
+
+def _ndjson_records(
+    first: dict[str, Any],
+    source: mmap.mmap | IO[bytes],
+    line_no: int,
+    decode: Callable[[bytes], Any],
+) -> Iterator[dict[str, Any]]:
+    """NDJSON records: the already decoded first line, then one record per remaining non-blank line."""
+    # A one-line API payload ({"records": [...]}) is a document, not a record
+    yield from _document_records(first) if "records" in first else (first,)
+    for line in iter(source.readline, b""):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = decode(line)
+        except ValueError as e:
+            raise ValueError(f"invalid JSON on line {line_no}: {e}") from e
+        if isinstance(record, dict):
+            yield record
+
+
+def read_records(
+    path: Path,
+    label: str = "Bronze",
+    fields: Iterable[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """iter_records for the command-line scripts: a missing or malformed file ends the run with a message."""
+    if not path.exists():
+        raise SystemExit(f"{label} file not found: {path}")
+    try:
+        yield from iter_records(path, fields)
+    except ValueError as e:
+        raise SystemExit(f"{label} file is not valid JSON: {path} ({e})") from e
@@ -0,0 +1,107 @@
+import hashlib
+import math
+from typing import Any
+
+
+def hash64(value: str) -> int:
+    """Stable 64-bit hash of a string (same across runs and processes, unlike hash())."""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """
+    Cardinality estimate in fixed memory (2**precision one-byte registers).
+    precision=14 uses 16 KB with ~0.8% standard error. Sketches with the same
+    precision merge by taking the register-wise max.
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, value: str) -> None:
+        h = hash64(value)
+        idx = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        self.registers[idx] = max(rank, self.registers[idx])
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs with different precision")
+        merged = HyperLogLog(self.precision)
+        merged.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return merged
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # small range: linear counting is more accurate
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+class SpaceSaving:
+    """
+    Top-k frequent items in fixed memory (Metwally et al.).
+
+    Keeps at most `capacity` counters. An item's reported count is an upper bound;
+    count - error is a lower bound, and error never exceeds total / capacity.
+    Counters are grouped in buckets by count so every update is O(1).
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: dict[Any, int] = {}
+        self.errors: dict[Any, int] = {}
+        self.buckets: dict[int, set[Any]] = {}
+        self.min_count = 0
+
+    def _move(self, item: Any, old: int, new: int) -> None:
+        if old:
+            bucket = self.buckets[old]
+            bucket.discard(item)
+            if not bucket:
+                del self.buckets[old]
+                if self.min_count == old:
+                    self.min_count = new
+        self.buckets.setdefault(new, set()).add(item)
+        self.counts[item] = new
+
+    def add(self, item: Any) -> None:
+        self.total += 1
+        count = self.counts.get(item)
+        if count is not None:
+            self._move(item, count, count + 1)
+            return
+        if len(self.counts) < self.capacity:
+            self.errors[item] = 0
+            self._move(item, 0, 1)
+            self.min_count = 1
+            return
+        # Replace an item with the minimum count; the newcomer inherits it as error.
+        floor = self.min_count
+        victim = next(iter(self.buckets[floor]))
+        self.buckets[floor].discard(victim)
+        del self.counts[victim]
+        del self.errors[victim]
+        if not self.buckets[floor]:
+            del self.buckets[floor]
+        self.errors[item] = floor
+        self.buckets.setdefault(floor + 1, set()).add(item)
+        self.counts[item] = floor + 1
+        self.min_count = floor + 1 if floor not in self.buckets else floor
+
+    def top(self, n: int) -> list[tuple[Any, int, int]]:
+        """[(item, count upper bound, error)] for the n largest counters."""
+        ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1], str(kv[0])))
+        return [(item, count, self.errors[item]) for item, count in ranked[:n]]
@@ -0,0 +1,224 @@
+import argparse
+import cProfile
+import json
+import pstats
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # not available on Windows: peak RSS and worker CPU time are left out
+    resource = None
+
+METRICS_DIR = Path("data/metrics")
+# Functions listed when printing a --profile summary
+PROFILE_TOP = 25
+
+
+def peak_rss_mib(children: bool = False) -> float | None:
+    """High-water resident set size so far, of this process or of its largest finished child process."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process plus that of finished child processes (e.g. --workers pools)."""
+    total = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        total += children.ru_utime + children.ru_stime
+    return total
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+
+def file_size(path: Path | None) -> int:
+    return path.stat().st_size if path is not None and path.exists() else 0
+
+
+class RunMetrics:
+    """
+    Structured metrics for one run of an entry point, written as JSON when the run ends.
+
+    Phases are timed with `phase()` (wall and CPU seconds, peak RSS, and the records,
+    bytes and HTTP requests counted while they ran); phases may nest, and a nested
+    phase is named "<parent>/<name>". Bytes read and written are counted where files
+    are read or written (`add_read` / `add_written`). HTTP requests are counted by a
+    response hook on the requests session (`instrument`), so every request made
+    through the session is timed, including those from worker threads; a server
+    counts the requests it answers with `record_request`. The scripts' own stats
+    dicts are attached with `add_stats`.
+    """
+
+    def __init__(self, entry_point: str) -> None:
+        self.entry_point = entry_point
+        self.started_at = datetime.now(timezone.utc)
+        self.options: dict[str, Any] = {}
+        self.phases: list[dict[str, Any]] = []
+        self.stats: dict[str, Any] = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.profile_path: Path | None = None
+        self._wall0 = time.perf_counter()
+        self._cpu0 = cpu_seconds()
+        self._open: list[str] = []
+        self._lock = threading.Lock()
+        self._http_latencies: list[float] = []
+        self._http_status: dict[str, int] = {}
+        self._http_bytes = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[dict[str, Any]]:
+        """
+        Time a block. The yielded dict is the phase's entry: set "records" to the number of
+        records it processed to get records/s.
+        """
+        entry: dict[str, Any] = {"phase": "/".join([*self._open, name]), "records": None}
+        self.phases.append(entry)
+        self._open.append(name)
+        wall0, cpu0 = time.perf_counter(), cpu_seconds()
+        read0, written0, http0 = self.bytes_read, self.bytes_written, len(self._http_latencies)
+        try:
+            yield entry
+        finally:
+            self._open.pop()
+            wall = time.perf_counter() - wall0
+            records = entry["records"]
+            entry.update({
+                "wall_seconds": round(wall, 4),
+                "cpu_seconds": round(cpu_seconds() - cpu0, 4),
+                "records_per_s": round(records / wall) if records and wall > 0 else None,
+                "bytes_read": self.bytes_read - read0,
+                "bytes_written": self.bytes_written - written0,
+                "http_requests": len(self._http_latencies) - http0,
+                "peak_rss_mib": peak_rss_mib(),
+            })
+
+    def add_read(self, n: int) -> None:
+        self.bytes_read += n
+
+    def add_written(self, n: int) -> None:
+        self.bytes_written += n
+
+    def add_stats(self, name: str, stats: dict[str, Any]) -> None:
+        self.stats[name] = dict(stats)
+
+    def record_request(self, latency_s: float, status: int, n_bytes: int) -> None:
+        """Count one HTTP request: its latency, status code and body bytes. Thread-safe."""
+        with self._lock:
+            self._http_latencies.append(latency_s)
+            key = str(status)
+            self._http_status[key] = self._http_status.get(key, 0) + 1
+            self._http_bytes += n_bytes
+
+    def record_response(self, response: Any, *args: Any, **kwargs: Any) -> None:
+        """requests response hook: latency until the headers arrived, status, and Content-Length when sent."""
+        self.record_request(response.elapsed.total_seconds(), response.status_code, int(response.headers.get("Content-Length") or 0))
+
+    def instrument(self, session: Any) -> Any:
+        """Count and time every request made through a requests.Session."""
+        session.hooks["response"].append(self.record_response)
+        return session
+
+    def http_summary(self) -> dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._http_latencies)
+            summary: dict[str, Any] = {
+                "requests": len(latencies),
+                "by_status": dict(sorted(self._http_status.items())),
+                "bytes": self._http_bytes,
+            }
+        if latencies:
+            summary["latency_seconds"] = {
+                "total": round(sum(latencies), 4),
+                "mean": round(sum(latencies) / len(latencies), 4),
+                **{f"p{round(q * 100)}": round(_percentile(latencies, q), 4) for q in (0.5, 0.9, 0.99)},
+                "max": round(latencies[-1], 4),
+            }
+        return summary
+
+    def to_json(self, status: str, error: str | None = None) -> dict[str, Any]:
+        return {
+            "entry_point": self.entry_point,
+            "started_at": self.started_at.strftime("%Y%m%dT%H%M%SZ"),
+            "status": status,
+            "error": error,
+            "options": self.options,
+            "wall_seconds": round(time.perf_counter() - self._wall0, 4),
+            "cpu_seconds": round(cpu_seconds() - self._cpu0, 4),
+            "peak_rss_mib": peak_rss_mib(),
+            "peak_rss_children_mib": peak_rss_mib(children=True),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "phases": self.phases,
+            "http": self.http_summary(),
+            "stats": self.stats,
+            "profile": None if self.profile_path is None else str(self.profile_path),
+        }
+
+    def file_stem(self) -> str:
+        return f"{self.entry_point}__{self.started_at.strftime('%Y%m%dT%H%M%SZ')}"
+
+    def write(self, metrics_dir: Path, status: str, error: str | None = None) -> Path:
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        path = metrics_dir / f"{self.file_stem()}.json"
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.to_json(status, error), indent=2, default=str), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+
+def add_metrics_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--metrics-dir",
+        type=Path,
+        default=METRICS_DIR,
+        help=f"Where to write this run's metrics file, <script>__<timestamp>.json (default: {METRICS_DIR}).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run with cProfile: saves <metrics file>.prof and prints the top functions by cumulative time.",
+    )
+
+
+@contextmanager
+def instrumented(entry_point: str, args: argparse.Namespace) -> Iterator[RunMetrics]:
+    """
+    Metrics (and, with --profile, a cProfile profile) for one run of an entry point.
+    The metrics file is written when the block ends, also when the run fails.
+    """
+    metrics = RunMetrics(entry_point)
+    metrics.options = vars(args)
+    metrics_dir = getattr(args, "metrics_dir", METRICS_DIR)
+    profiler = cProfile.Profile() if getattr(args, "profile", False) else None
+    status, error = "ok", None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield metrics
+    except BaseException as e:
+        status, error = "error", str(e) or type(e).__name__
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            metrics_dir.mkdir(parents=True, exist_ok=True)
+            metrics.profile_path = metrics_dir / f"{metrics.file_stem()}.prof"
+            profiler.dump_stats(metrics.profile_path)
+            print(f"\n---Profile (top {PROFILE_TOP} by cumulative time)---")
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            print(f"Profile: {metrics.profile_path} (open with: python -m pstats {metrics.profile_path})")
+        print(f"Metrics: {metrics.write(metrics_dir, status, error)}")
@@ -0,0 +1,155 @@
+import argparse
+import hashlib
+import json
+import shlex
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .gold import build_weekly_trends as gold
+from .gold.publish import MANIFEST_NAME
+from .ingestion import pull_recent48h as ingest
+from .ingestion.bronze_io import find_bronze_files
+from .metrics import RunMetrics, add_metrics_arguments, instrumented
+from .silver import dedupe_latest_by_recordid as silver
+from .silver.partitions import INDEX_NAME, load_index
+
+STAGES = ["ingest", "silver", "gold"]
+PIPELINE_STATE_PATH = Path("data/_pipeline_state.json")
+# Stage options that only affect metrics/profiling, not a stage's outputs
+METRICS_OPTIONS = ("metrics_dir", "profile")
+
+
+def load_pipeline_state(path: Path) -> dict[str, Any]:
+    """{"<stage>": {"fingerprint": str, "completed_at": str}} for the last successful run of each stage."""
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise SystemExit(f"Pipeline state is not valid JSON: {path} (delete it or use --force)") from e
+
+
+def save_pipeline_state(path: Path, state: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def fingerprint(parts: Any) -> str:
+    return hashlib.blake2b(json.dumps(parts, sort_keys=True, default=str).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def stat_entry(path: Path) -> list:
+    st = path.stat()
+    return [str(path), st.st_size, st.st_mtime_ns]
+
+
+def stage_options(args: argparse.Namespace) -> dict[str, Any]:
+    return {k: v for k, v in vars(args).items() if k not in METRICS_OPTIONS}
+
+
+def silver_inputs(args: argparse.Namespace) -> str:
+    """Bronze files (name, size, mtime) matching the Silver pattern, the Silver options, and whether Silver exists."""
+    files = find_bronze_files(Path("data/bronze"), args.pattern)
+    manifest = silver.load_manifest(silver.MANIFEST_PATH)
+    output = manifest["silver_file"]
+    return fingerprint({
+        "bronze": [stat_entry(f) for f in files],
+        "options": stage_options(args),
+        "silver_file": output if output and Path(output).exists() else None,
+    })
+
+
+def gold_inputs(args: argparse.Namespace) -> str:
+    """The Silver snapshot Gold reads (its partition hashes, or the file), the Gold options, and the published manifest."""
+    path = gold.current_silver(args.silver_file)
+    if path is not None and path.name == INDEX_NAME:
+        source: Any = {"index": str(path), "partitions": load_index(path)["partitions"]}
+    else:
+        source = stat_entry(path) if path is not None and path.exists() else None
+    manifest_path = Path("data/gold") / MANIFEST_NAME
+    return fingerprint({
+        "silver": source,
+        "options": stage_options(args),
+        "manifest": stat_entry(manifest_path) if manifest_path.exists() else None,
+    })
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run ingest -> Silver -> Gold in one process. Records are handed between stages in memory; "
+            "each stage still writes its usual files, and is skipped when its inputs match its last successful run."
+        )
+    )
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="Stages to run, in pipeline order (default: all).")
+    parser.add_argument("--force", action="store_true", help="Run every selected stage even if its inputs are unchanged.")
+    parser.add_argument("--ingest-args", default="", help='Options for pull_recent48h, as one string (e.g. "--workers 4").')
+    parser.add_argument("--silver-args", default="", help="Options for dedupe_latest_by_recordid, as one string.")
+    parser.add_argument("--gold-args", default="", help="Options for build_weekly_trends, as one string.")
+    add_metrics_arguments(parser)
+    return parser
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> None:
+    """Run the selected stages; each stage's phases are recorded in `metrics` as "<stage>/<phase>"."""
+    stage_args = {
+        "ingest": ingest.build_parser().parse_args(shlex.split(args.ingest_args)),
+        "silver": silver.build_parser().parse_args(shlex.split(args.silver_args)),
+        "gold": gold.build_parser().parse_args(shlex.split(args.gold_args)),
+    }
+    state = load_pipeline_state(PIPELINE_STATE_PATH)
+
+    def done(stage: str, stage_fingerprint: str) -> None:
+        state[stage] = {"fingerprint": stage_fingerprint, "completed_at": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")}
+        save_pipeline_state(PIPELINE_STATE_PATH, state)
+
+    def unchanged(stage: str, stage_fingerprint: str) -> bool:
+        last = state.get(stage)
+        if args.force or last is None or last["fingerprint"] != stage_fingerprint:
+            return False
+        print(f"\n=== {stage}: inputs unchanged since {last['completed_at']}; skipped ===")
+        metrics.stats.setdefault("skipped_stages", []).append(stage)
+        return True
+
+    preloaded: dict[Path, list[dict[str, Any]]] = {}
+    partition_records = None
+
+    # Ingestion reads from the API, so it always runs; the watermark keeps it incremental
+    if "ingest" in args.stages:
+        print("\n=== ingest ===")
+        with metrics.phase("ingest"):
+            pulled = ingest.run(stage_args["ingest"], keep_records=True, metrics=metrics)
+        if pulled["bronze_file"] is not None:
+            preloaded[pulled["bronze_file"]] = pulled["records"]
+
+    if "silver" in args.stages:
+        silver_fingerprint = silver_inputs(stage_args["silver"])
+        if not unchanged("silver", silver_fingerprint):
+            print("\n=== silver ===")
+            with metrics.phase("silver"):
+                built = silver.run(stage_args["silver"], preloaded, metrics=metrics)
+            partition_records = built["partition_records"]
+            # Fingerprint again: the Silver manifest now names this run's output
+            done("silver", silver_inputs(stage_args["silver"]))
+    preloaded.clear()
+
+    if "gold" in args.stages:
+        gold_fingerprint = gold_inputs(stage_args["gold"])
+        if not unchanged("gold", gold_fingerprint):
+            print("\n=== gold ===")
+            with metrics.phase("gold"):
+                gold.run(stage_args["gold"], partition_records, metrics=metrics)
+            done("gold", gold_inputs(stage_args["gold"]))
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    with instrumented("pipeline", args) as metrics:
+        run(args, metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import itertools
+import json
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta, timezone
+from functools import cache
+from typing import Any
+
+from ..ingestion.bronze_io import DT_MIN, parse_iso_dt
+from ..ingestion.reader import loads
+
+try:
+    import numpy as np
+except ImportError:  # optional: without it timestamps are parsed one record at a time
+    np = None
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+US_PER_DAY = 86_400_000_000
+# DT_MIN as epoch microseconds: missing/invalid timestamps sort before every real one
+TS_MISSING = (DT_MIN - EPOCH) // timedelta(microseconds=1)
+
+CATEGORICAL_FIELDS = ("department", "local_area", "channel", "status", "service_request_type")
+# The "fields" keys CompactRecord reads: enough to project records on when no payload is kept
+COMPACT_FIELDS = (
+    "last_modified_timestamp",
+    "service_request_open_timestamp",
+    "service_request_close_date",
+    *CATEGORICAL_FIELDS,
+)
+# Records per batch when timestamp columns are converted in bulk
+CONVERT_BATCH = 4096
+
+
+def epoch_us(value: Any) -> int:
+    """ISO timestamp string -> integer microseconds since the Unix epoch (UTC); TS_MISSING if missing/invalid."""
+    if not value:
+        return TS_MISSING
+    return (parse_iso_dt(str(value)) - EPOCH) // timedelta(microseconds=1)
+
+
+def epoch_us_array(values: list[Any]) -> np.ndarray:
+    """
+    epoch_us for a whole column of timestamps, as an int64 array (requires numpy).
+
+    The API's canonical form ("YYYY-MM-DDTHH:MM:SS+00:00") is decoded with array
+    arithmetic on the raw bytes, with no datetime per value; anything else (other
+    offsets, "Z", fractional seconds, missing, garbage) falls back to epoch_us for
+    that element only, so missing/invalid values are TS_MISSING.
+    """
+    n = len(values)
+    try:
+        # One spare byte: a non-zero byte 25 means the string is too long to be canonical.
+        raw = np.array(values, dtype="S26")
+    except (UnicodeEncodeError, TypeError, ValueError):
+        raw = np.array([v if isinstance(v, str) and v.isascii() else "" for v in values], dtype="S26")
+    b = raw.view(np.uint8).reshape(n, 26)
+
+    def num(*cols: int) -> np.ndarray:
+        out = np.zeros(n, dtype=np.int64)
+        for c in cols:
+            out = out * 10 + (b[:, c].astype(np.int64) - ord("0"))
+        return out
+
+    digit_cols = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 20, 21, 23, 24]
+    digits = b[:, digit_cols]
+    ok = ((digits >= ord("0")) & (digits <= ord("9"))).all(axis=1) & (b[:, 25] == 0)
+    for col, sep in ((4, "-"), (7, "-"), (10, "T"), (13, ":"), (16, ":"), (19, "+"), (22, ":")):
+        ok &= b[:, col] == ord(sep)
+    ok &= (num(20, 21) == 0) & (num(23, 24) == 0)
+
+    year, month, day = num(0, 1, 2, 3), num(5, 6), num(8, 9)
+    hour, minute, second = num(11, 12), num(14, 15), num(17, 18)
+
+    leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    month_days = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+    days_in_month = month_days[np.clip(month, 0, 12)] + ((month == 2) & leap)
+    ok &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month)
+    ok &= (hour <= 23) & (minute <= 59) & (second <= 59)
+
+    # days since 1970-01-01 from a proleptic Gregorian civil date
+    y = year - (month <= 2)
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    doy = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+
+    out = (days * 86400 + hour * 3600 + minute * 60 + second) * 1_000_000
+    for i in np.flatnonzero(~ok).tolist():
+        out[i] = epoch_us(values[i])
+    return out
+
+
+def epoch_day(value: Any) -> int | None:
+    """Calendar date (YYYY-MM-DD, any time part ignored) -> days since 1970-01-01; None if missing/invalid."""
+    if not value:
+        return None
+    try:
+        return (date.fromisoformat(str(value)[:10]) - date(1970, 1, 1)).days
+    except ValueError:
+        return None
+
+
+def epoch_us_column(values: list[Any]) -> list[int]:
+    """epoch_us of every value: in bulk with epoch_us_array when numpy is installed, else one at a time."""
+    if np is None:
+        return [epoch_us(v) for v in values]
+    return epoch_us_array(values).tolist()
+
+
+@cache
+def _monday_of_day(day: int) -> str:
+    # 1970-01-01 was a Thursday (weekday 3)
+    return (date(1970, 1, 1) + timedelta(days=day - (day + 3) % 7)).isoformat()
+
+
+def week_start(ts_us: int) -> str | None:
+    """Monday (UTC) of the week containing ts_us, as YYYY-MM-DD; None for TS_MISSING."""
+    if ts_us == TS_MISSING:
+        return None
+    return _monday_of_day(ts_us // US_PER_DAY)
+
+
+class StringPool:
+    """Intern table: equal values share one str object (dictionary encoding without codes)."""
+
+    def __init__(self) -> None:
+        self._values: dict[str, str] = {}
+
+    def intern(self, value: str) -> str:
+        return self._values.setdefault(value, value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class CompactRecord:
+    """
+    Memory-light stand-in for an API record during Silver/Gold processing.
+
+    Only what the pipeline computes on is kept as attributes: the recordid, the
+    last-modified and open timestamps as epoch microseconds, the close date as days
+    since the epoch (None when the request is not closed), and the categorical
+    fields as pooled strings (stripped; "" for an empty value, None when the key
+    is missing). The full record is kept as compact JSON bytes so it can be written
+    back out unchanged (`to_record`).
+    """
+
+    __slots__ = (
+        "channel",
+        "close_day",
+        "department",
+        "last_modified_us",
+        "local_area",
+        "open_us",
+        "payload",
+        "recordid",
+        "service_request_type",
+        "status",
+    )
+
+    def __init__(
+        self,
+        recordid: str,
+        last_modified_us: int,
+        open_us: int,
+        payload: bytes | None,
+        close_day: int | None = None,
+        **categories: str | None,
+    ) -> None:
+        self.recordid = recordid
+        self.last_modified_us = last_modified_us
+        self.open_us = open_us
+        self.close_day = close_day
+        for name in CATEGORICAL_FIELDS:
+            setattr(self, name, categories.get(name))
+        self.payload = payload
+
+    @classmethod
+    def from_record(
+        cls,
+        record: dict[str, Any],
+        pool: StringPool,
+        keep_payload: bool = True,
+        timestamps: tuple[int, int] | None = None,
+    ) -> CompactRecord:
+        """
+        `timestamps` are the record's (last_modified_us, open_us) when already converted
+        in bulk (compact_batch); otherwise both are parsed here.
+        """
+        fields = record.get("fields") or {}
+        if not isinstance(fields, dict):
+            fields = {}
+        categories = {}
+        for name in CATEGORICAL_FIELDS:
+            value = fields.get(name)
+            if name in fields:
+                value = str(value).strip() if value is not None else ""
+                categories[name] = pool.intern(value)
+        if timestamps is None:
+            timestamps = (
+                epoch_us(fields.get("last_modified_timestamp")),
+                epoch_us(fields.get("service_request_open_timestamp")),
+            )
+        last_modified_us, open_us = timestamps
+        rid = record.get("recordid")
+        return cls(
+            recordid=str(rid) if rid else "",
+            last_modified_us=last_modified_us,
+            open_us=open_us,
+            close_day=epoch_day(fields.get("service_request_close_date")),
+            payload=json.dumps(record, separators=(",", ":")).encode("utf-8") if keep_payload else None,
+            **categories,
+        )
+
+    def to_record(self) -> dict[str, Any]:
+        """The original record (requires the payload)."""
+        if self.payload is None:
+            raise ValueError(f"CompactRecord {self.recordid!r} was built without its payload")
+        return loads(self.payload)
+
+
+def compact_batch(
+    records: list[dict[str, Any]],
+    pool: StringPool,
+    keep_payload: bool = True,
+) -> list[CompactRecord]:
+    """
+    CompactRecords for a batch of dict records. The last-modified and open timestamp
+    columns are converted in bulk (epoch_us_column), not one datetime per record.
+    """
+    fields = [r.get("fields") if isinstance(r.get("fields"), dict) else {} for r in records]
+    last_modified = epoch_us_column([f.get("last_modified_timestamp") for f in fields])
+    opened = epoch_us_column([f.get("service_request_open_timestamp") for f in fields])
+    return [
+        CompactRecord.from_record(r, pool, keep_payload, timestamps)
+        for r, timestamps in zip(records, zip(last_modified, opened))
+    ]
+
+
+def compact_records(
+    records: Iterable[dict[str, Any]],
+    pool: StringPool | None = None,
+    keep_payload: bool = True,
+) -> Iterator[CompactRecord]:
+    """
+    Stream dict records as CompactRecords, sharing one StringPool across the stream.
+    Records are converted CONVERT_BATCH at a time (compact_batch).
+    """
+    pool = StringPool() if pool is None else pool
+    it = iter(records)
+    while batch := list(itertools.islice(it, CONVERT_BATCH)):
+        yield from compact_batch(batch, pool, keep_payload)
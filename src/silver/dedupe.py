@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import itertools
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from typing import Any
 
+from .compact import TS_MISSING, CompactRecord, epoch_us_array
+
+try:
+    import numpy as np
+except ImportError:  # optional: only needed for engine="numpy"
+    np = None
+
 UTC = timezone.utc
 DT_MIN = datetime.min.replace(tzinfo=UTC)
+ENGINES = ("python", "numpy")
 
 
 def _to_dt(s: str | None) -> datetime:
@@ -38,24 +48,49 @@ def _to_dt(s: str | None) -> datetime:
 
 
 def dedupe_latest(
-    records: list[dict[str, Any]],
+    records: Iterable[dict[str, Any]] | Iterable[CompactRecord],
     id_key: str = "recordid",
     ts_key: str = "last_modified_timestamp",
-) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    engine: str = "python",
+) -> tuple[list[Any], dict[str, int]]:
     """
     Keep the latest version per recordid based on fields[ts_key].
 
+    engine="python" compares records one at a time in a dict; engine="numpy"
+    picks the winners with a single lexsort (requires numpy). Both return the
+    same records in the same order (first-seen recordid order; ties keep the
+    earlier record) and the same stats.
+
+    `records` may be any iterable: the python engine consumes it in one pass and
+    only holds the current winners, so a streamed input keeps memory flat.
+
+    Records may also be CompactRecords; then their recordid and integer
+    last_modified_us are compared directly (id_key/ts_key do not apply).
+
     Returns: (deduped_records, stats)
     """
+    if engine == "numpy":
+        return _dedupe_latest_numpy(records if isinstance(records, list) else list(records), id_key, ts_key)
+    if engine != "python":
+        raise ValueError(f"Unknown dedupe engine: {engine!r} (expected one of {ENGINES})")
+
+    # Peek at the first record to pick the representation, without consuming a stream
+    it = iter(records)
+    first = next(it, None)
+    records = itertools.chain([first], it) if first is not None else ()
+    if isinstance(first, CompactRecord):
+        return _dedupe_latest_compact(records)
+
     best_by_id: dict[str, dict[str, Any]] = {}
     stats = {
-        "input_records": len(records),
+        "input_records": 0,
         "kept_records": 0,
         "missing_id": 0,
         "invalid_or_missing_ts": 0,
     }
 
     for r in records:
+        stats["input_records"] += 1
         rid = r.get(id_key)
         if not rid:
             stats["missing_id"] += 1
@@ -82,3 +117,127 @@ def dedupe_latest(
     deduped = list(best_by_id.values())
     stats["kept_records"] = len(deduped)
     return deduped, stats
+
+
+def _dedupe_latest_compact(records: Iterable[CompactRecord]) -> tuple[list[CompactRecord], dict[str, int]]:
+    """The python engine for CompactRecords: timestamps are already integers, so no parsing per comparison."""
+    best_by_id: dict[str, CompactRecord] = {}
+    stats = {
+        "input_records": 0,
+        "kept_records": 0,
+        "missing_id": 0,
+        "invalid_or_missing_ts": 0,
+    }
+
+    for r in records:
+        stats["input_records"] += 1
+        rid = r.recordid
+        if not rid:
+            stats["missing_id"] += 1
+            continue
+        if r.last_modified_us == TS_MISSING:
+            stats["invalid_or_missing_ts"] += 1
+        prev = best_by_id.get(rid)
+        if prev is None or r.last_modified_us > prev.last_modified_us:
+            best_by_id[rid] = r
+
+    deduped = list(best_by_id.values())
+    stats["kept_records"] = len(deduped)
+    return deduped, stats
+
+
+def _id_hashes(ids: list[Any]) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    64-bit grouping keys for ids, computed on the raw bytes without a Python dict.
+
+    Returns (keys, id_bytes). id_bytes is kept so the caller can confirm that equal
+    keys really mean equal ids; it is None when ids are not plain ASCII strings, in
+    which case the keys are exact dict codes instead of hashes.
+    """
+    if {type(i) for i in ids} == {str}:
+        try:
+            arr = np.array(ids, dtype="S")
+        except UnicodeEncodeError:
+            arr = None
+        if arr is not None:
+            width = -(-arr.itemsize // 8) * 8
+            words = arr.astype(f"S{width}").view(np.uint64).reshape(len(ids), -1)
+            h = np.full(len(ids), 0xCBF29CE484222325, dtype=np.uint64)
+            for col in words.T:
+                h = (h ^ col) * np.uint64(0x100000001B3)
+            return h.view(np.int64), arr
+    return _id_codes(ids), None
+
+
+def _id_codes(ids: list[Any]) -> np.ndarray:
+    code_by_id: dict[Any, int] = {}
+    return np.asarray([code_by_id.setdefault(i, len(code_by_id)) for i in ids], dtype=np.int64)
+
+
+def _dedupe_latest_numpy(
+    records: list[dict[str, Any]],
+    id_key: str,
+    ts_key: str,
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """
+    Vectorized dedupe_latest.
+
+    Ids are hashed and timestamps decoded to epoch microseconds in bulk
+    (_id_hashes, compact.epoch_us_array). One lexsort by (id, -timestamp, position)
+    puts each id's winner first in its group; winners are then re-ordered by
+    the id's first position so the output matches the dict-based engine.
+    """
+    if np is None:
+        raise SystemExit("engine='numpy' requires numpy (pip install numpy).")
+
+    stats = {
+        "input_records": len(records),
+        "kept_records": 0,
+        "missing_id": 0,
+        "invalid_or_missing_ts": 0,
+    }
+
+    compact = bool(records) and isinstance(records[0], CompactRecord)
+    ids = [r.recordid for r in records] if compact else [r.get(id_key) for r in records]
+    positions = [i for i, rid in enumerate(ids) if rid]
+    stats["missing_id"] = len(records) - len(positions)
+    if not positions:
+        return [], stats
+    if stats["missing_id"]:
+        ids = [ids[i] for i in positions]
+
+    if compact:
+        ts_arr = np.fromiter((records[i].last_modified_us for i in positions), dtype=np.int64, count=len(positions))
+        invalid = ts_arr == TS_MISSING
+    else:
+        raw_ts = [(records[i].get("fields") or {}).get(ts_key) for i in positions]
+        ts_arr = epoch_us_array(raw_ts)
+        invalid = ts_arr == TS_MISSING
+    stats["invalid_or_missing_ts"] = int(invalid.sum())
+    pos_arr = np.asarray(positions, dtype=np.int64)
+
+    keys, id_bytes = _id_hashes(ids)
+    # lexsort is stable and positions are ascending: by key, then latest timestamp, then earliest position
+    order = np.lexsort((-ts_arr, keys))
+    sorted_keys = keys[order]
+    same_as_prev = sorted_keys[1:] == sorted_keys[:-1]
+
+    if id_bytes is not None:
+        sorted_ids = id_bytes[order]
+        if (sorted_ids[1:][same_as_prev] != sorted_ids[:-1][same_as_prev]).any():
+            # 64-bit hash collision between distinct ids: redo with exact codes
+            keys = _id_codes(ids)
+            order = np.lexsort((-ts_arr, keys))
+            sorted_keys = keys[order]
+            same_as_prev = sorted_keys[1:] == sorted_keys[:-1]
+
+    group_starts = np.flatnonzero(np.concatenate(([True], ~same_as_prev)))
+    sorted_pos = pos_arr[order]
+    winners = sorted_pos[group_starts]
+    # Emit winners in first-seen order of their id, like the dict-based engine
+    first_seen = np.minimum.reduceat(sorted_pos, group_starts)
+    winners = winners[np.argsort(first_seen)]
+
+    deduped = [records[i] for i in winners.tolist()]
+    stats["kept_records"] = len(deduped)
+    return deduped, stats
@@ -1,60 +1,240 @@
 import argparse
+import hashlib
+import itertools
 import json
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
-from .dedupe import dedupe_latest
+from ..ingestion.bronze_io import find_bronze_files
+from ..ingestion.reader import read_records
+from ..metrics import RunMetrics, add_metrics_arguments, file_size, instrumented
+from .compact import CompactRecord, StringPool, compact_records
+from .dedupe import ENGINES, dedupe_latest
+from .partitions import (
+    INDEX_NAME,
+    iter_partition_records,
+    partitions_size,
+    write_week_partitions,
+)
+
+SILVER_DIR = Path("data/silver")
+WEEKLY_DIR = SILVER_DIR / "weekly"
+MANIFEST_PATH = SILVER_DIR / "_manifest.json"
+
+
+def iter_file_records(path: Path) -> Iterator[dict[str, Any]]:
+    """
+    Stream records from a Bronze (or Silver) file one at a time, whatever its format
+    (see reader.iter_records). A partitioned Silver index (_index.json) streams all of its partitions.
+    Records are read whole: Silver writes them back out unchanged.
+    """
+    if path.name != INDEX_NAME:
+        yield from read_records(path, "Bronze")
+        return
+    try:
+        yield from iter_partition_records(path)
+    except ValueError as e:
+        raise SystemExit(f"Bronze file is not valid JSON: {path} ({e})") from e
 
 
 def load_records(path: Path) -> list[dict[str, Any]]:
-    """Load records from a Bronze file, supporting both shapes:
-    1) list of records
-    2) dict with a 'records' key (list)
+    """Load all records from a Bronze file into a list (see iter_file_records)."""
+    return list(iter_file_records(path))
+
+
+def counted(path: Path, label: str = "") -> Iterator[dict[str, Any]]:
+    """Stream a file's records and report how many were read once it is exhausted."""
+    n = 0
+    for r in iter_file_records(path):
+        n += 1
+        yield r
+    print(f"Loaded {n} records from {label}{path.name}")
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_manifest(path: Path) -> dict[str, Any]:
+    """
+    Manifest of the last Silver build:
+    {"silver_file": "...", "processed": {"<bronze path>": {"size", "mtime_ns", "sha256"}}}
     """
+    if not path.exists():
+        return {"silver_file": None, "processed": {}}
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        manifest = json.loads(path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as e:
-        raise SystemExit(f"Invalid JSON in Bronze file: {path}") from e
+        raise SystemExit(f"Silver manifest is not valid JSON: {path} (use --full-rebuild)") from e
+    manifest.setdefault("silver_file", None)
+    manifest.setdefault("processed", {})
+    return manifest
 
-    if isinstance(payload, list):
-        return [r for r in payload if isinstance(r, dict)]
 
-    if isinstance(payload, dict):
-        records = payload.get("records", [])
-        if not isinstance(records, list):
-            raise SystemExit(f'Unexpected payload in {path}: "records" is not a list.')
-        return [r for r in records if isinstance(r, dict)]
+def file_entry(path: Path, prev: dict[str, Any] | None) -> dict[str, Any]:
+    """Size/mtime/hash entry for a Bronze file; the hash is reused if size and mtime are unchanged."""
+    st = path.stat()
+    if prev and prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns:
+        return prev
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_sha256(path)}
 
-    raise SystemExit(f"Unexpected Bronze JSON shape in {path} (expected list or dict).")
 
+def dedupe_file(path: Path, engine: str) -> tuple[list[CompactRecord], dict[str, int]]:
+    """Map step for --workers: stream one Bronze file (or the previous Silver snapshot) and keep only its local winners."""
+    return dedupe_latest(compact_records(iter_file_records(path)), engine=engine)
 
-def main() -> None:
+
+def merge_parts(
+    parts: list[tuple[list[CompactRecord], dict[str, int]]],
+    engine: str,
+) -> tuple[list[CompactRecord], dict[str, int]]:
+    """
+    Reduce step for --workers: dedupe the concatenated per-part winners.
+    Keep-latest is associative, so this equals deduping all raw records at once;
+    input/missing/invalid stats are summed from the parts so they match a serial run.
+    """
+    deduped, merge_stats = dedupe_latest([r for winners, _ in parts for r in winners], engine=engine)
+    stats = {key: sum(part_stats[key] for _, part_stats in parts) for key in ("input_records", "missing_id", "invalid_or_missing_ts")}
+    stats["kept_records"] = merge_stats["kept_records"]
+    return deduped, stats
+
+
+def write_silver_file(records: list[CompactRecord], out_path: Path) -> None:
+    """Write records as one indented JSON list (same bytes as json.dump(..., indent=2)), one record at a time."""
+    with open(out_path, "w", encoding="utf-8") as f:
+        if not records:
+            f.write("[]")
+            return
+        f.write("[\n")
+        for i, r in enumerate(records):
+            if i:
+                f.write(",\n")
+            f.write("  " + json.dumps(r.to_record(), indent=2).replace("\n", "\n  "))
+        f.write("\n]")
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Build Silver: dedupe latest record per recordid across Bronze files.")
     parser.add_argument(
         "--pattern",
         type=str,
-        default="*.json",
-        help="Glob pattern for Bronze files (default: *.json). Example: '*__last48h__*.json'",
+        default="*",
+        help="Glob pattern for Bronze file names, searched recursively (default: *). Example: '*__last48h__*'",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="python",
+        help="Dedupe engine: python (dict, no extra deps) or numpy (vectorized lexsort) (default: python).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parse and locally dedupe the previous Silver snapshot and each new Bronze file in N processes, then merge the winners (default: 1, serial).",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=["weekly", "file"],
+        default="weekly",
+        help="weekly: one file per open-week under data/silver/weekly/ plus _index.json; file: one timestamped JSON (default: weekly).",
+    )
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Ignore the manifest and previous Silver snapshot; re-dedupe every Bronze file.",
+    )
+    add_metrics_arguments(parser)
+    return parser
+
+
+def run(
+    args: argparse.Namespace,
+    preloaded: dict[Path, list[dict[str, Any]]] | None = None,
+    metrics: RunMetrics | None = None,
+) -> dict[str, Any]:
+    """
+    Merge new/changed Bronze files into Silver.
 
+    `preloaded` maps Bronze paths to records already in memory (e.g. just pulled by the
+    pipeline); those files are not parsed again. Returns {"silver_path": path or None,
+    "up_to_date": bool, "partition_records": {week: [CompactRecord]} or None}; partition
+    records are only set for the weekly layout. Phases, bytes read/written and the dedupe
+    stats are recorded in `metrics`.
+    """
+    preloaded = preloaded or {}
+    metrics = metrics or RunMetrics("dedupe_latest_by_recordid")
     bronze_dir = Path("data/bronze")
-    in_files = sorted(bronze_dir.glob(args.pattern))
+    in_files = find_bronze_files(bronze_dir, args.pattern)
 
     if not in_files:
         raise SystemExit(f"No Bronze files found in {bronze_dir} matching pattern: {args.pattern}")
 
-    combined: list[dict[str, Any]] = []
-    for f in in_files:
-        recs = load_records(f)
-        print(f"Loaded {len(recs)} records from {f.name}")
-        combined.extend(recs)
+    manifest = {"silver_file": None, "processed": {}} if args.full_rebuild else load_manifest(MANIFEST_PATH)
+    prev_silver = Path(manifest["silver_file"]) if manifest["silver_file"] else None
+    if prev_silver is not None and not prev_silver.exists():
+        print(f"Previous Silver snapshot is missing ({prev_silver}); rebuilding from scratch.")
+        manifest = {"silver_file": None, "processed": {}}
+        prev_silver = None
+
+    entries = {str(f): file_entry(f, manifest["processed"].get(str(f))) for f in in_files}
+    new_files = [f for f in in_files if manifest["processed"].get(str(f)) != entries[str(f)]]
+
+    if prev_silver is not None and not new_files:
+        print(f"No new or changed Bronze files since {prev_silver}. Silver is up to date.")
+        return {"silver_path": prev_silver, "up_to_date": True, "partition_records": None}
+
+    if prev_silver is not None:
+        print(f"Merging {len(new_files)} new/changed Bronze file(s) of {len(in_files)} into {prev_silver.name}")
+    else:
+        print(f"Full rebuild from {len(in_files)} Bronze file(s)")
+
+    with metrics.phase("dedupe") as dedupe_phase:
+        # Records are streamed file by file; only the running winners are held in memory,
+        # as CompactRecords (the numpy engine materializes its input).
+        # Previous winners go first so ties keep the older version, as a full rebuild would.
+        pool = StringPool()
 
-    deduped, stats = dedupe_latest(combined)
+        def new_records(f: Path) -> Iterable[dict[str, Any]]:
+            if f in preloaded:
+                print(f"Using {len(preloaded[f])} in-memory records for {f.name}")
+                return preloaded[f]
+            return counted(f)
 
-    # Optional but helpful: deterministic order for stable diffs/tests
-    deduped.sort(key=lambda r: str(r.get("recordid", "")))
+        if args.workers > 1:
+            # The previous snapshot is one more map task, read alongside the new Bronze files
+            to_parse = ([prev_silver] if prev_silver is not None else []) + [f for f in new_files if f not in preloaded]
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                parsed = dict(zip(to_parse, executor.map(dedupe_file, to_parse, [args.engine] * len(to_parse))))
+            parts = []
+            if prev_silver is not None:
+                parts.append(parsed[prev_silver])
+                print(f"Loaded {parsed[prev_silver][1]['input_records']} records from previous Silver snapshot {prev_silver.name}")
+            for f in new_files:
+                part = parsed[f] if f in parsed else dedupe_latest(compact_records(new_records(f), pool), engine=args.engine)
+                print(f"Loaded {part[1]['input_records']} records from {f.name} ({part[1]['kept_records']} local winners)")
+                parts.append(part)
+            deduped, stats = merge_parts(parts, engine=args.engine)
+        else:
+            prev_stream = compact_records(counted(prev_silver, "previous Silver snapshot ") if prev_silver is not None else (), pool)
+            combined = itertools.chain(prev_stream, compact_records(itertools.chain.from_iterable(new_records(f) for f in new_files), pool))
+            deduped, stats = dedupe_latest(combined, engine=args.engine)
+
+        # Optional but helpful: deterministic order for stable diffs/tests
+        deduped.sort(key=attrgetter("recordid"))
+        metrics.add_read(sum(file_size(f) for f in new_files if f not in preloaded))
+        if prev_silver is not None:
+            metrics.add_read(partitions_size(prev_silver) if prev_silver.name == INDEX_NAME else file_size(prev_silver))
+        dedupe_phase["records"] = stats["input_records"]
+    metrics.add_stats("dedupe", stats)
 
     print("\n--- Dedupe stats ---")
     print("Input records (combined):", stats["input_records"])
@@ -63,12 +243,40 @@ def main() -> None:
     print("Missing recordid skipped:", stats["missing_id"])
     print("Invalid/missing timestamps seen:", stats["invalid_or_missing_ts"])
 
-    out_dir = Path("data/silver")
-    out_dir.mkdir(parents=True, exist_ok=True)
-    run_ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    out_path = out_dir / f"311_requests__silver_deduped__{run_ts}.json"
-    out_path.write_text(json.dumps(deduped, indent=2), encoding="utf-8")
-    print("\nSaved Silver deduped file to:", out_path)
+    with metrics.phase("write") as write_phase:
+        partition_records = None
+        if args.layout == "weekly":
+            result = write_week_partitions(deduped, WEEKLY_DIR, reuse=not args.full_rebuild)
+            partition_records = result["records"]
+            metrics.add_written(result["bytes_written"])
+            metrics.add_stats("partitions", {k: result[k] for k in ("written", "unchanged", "reused", "removed")})
+            out_path = WEEKLY_DIR / INDEX_NAME
+            print(f"\nSaved Silver week partitions to: {WEEKLY_DIR}")
+            print(
+                f"Partitions: {len(result['index']['partitions'])} "
+                f"(written: {result['written']}, unchanged: {result['unchanged']}, removed: {result['removed']})"
+            )
+        else:
+            SILVER_DIR.mkdir(parents=True, exist_ok=True)
+            run_ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            out_path = SILVER_DIR / f"311_requests__silver_deduped__{run_ts}.json"
+            write_silver_file(deduped, out_path)
+            metrics.add_written(file_size(out_path))
+            print("\nSaved Silver deduped file to:", out_path)
+        write_phase["records"] = len(deduped)
+
+    # Previously processed files that no longer match the pattern stay recorded.
+    manifest["processed"].update(entries)
+    manifest["silver_file"] = str(out_path)
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    print("Updated Silver manifest:", MANIFEST_PATH)
+    return {"silver_path": out_path, "up_to_date": False, "partition_records": partition_records}
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    with instrumented("dedupe_latest_by_recordid", args) as metrics:
+        run(args, metrics=metrics)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+import hashlib
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from ..ingestion.reader import iter_records
+from .compact import CompactRecord, week_start
+
+INDEX_NAME = "_index.json"
+UNKNOWN_WEEK = "unknown"
+
+
+def partition_file_name(week: str) -> str:
+    return f"week={week}.json"
+
+
+def load_index(index_path: Path) -> dict[str, Any]:
+    """
+    Partition index:
+    {"partitions": {"<week>": {"file": "week=<week>.json", "rows": int, "sha256": str, "versions": str}}}
+    """
+    if not index_path.exists():
+        return {"partitions": {}}
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise SystemExit(f"Silver partition index is not valid JSON: {index_path}") from e
+    index.setdefault("partitions", {})
+    return index
+
+
+def week_versions(rows: list[CompactRecord]) -> str:
+    """Digest of the (recordid, last_modified) versions in a partition: equal digests mean the same records."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\n".join(f"{r.recordid}\t{r.last_modified_us}" for r in rows).encode("utf-8"))
+    return h.hexdigest()
+
+
+def write_week_partitions(records: Iterable[CompactRecord], out_dir: Path, reuse: bool = True) -> dict[str, Any]:
+    """
+    Write Silver as one JSON file per open-week plus an index with each partition's
+    row count, content hash and record versions digest. Records inside a partition are
+    sorted by recordid, so an unchanged week hashes the same and its file is left untouched.
+    Partitions that no longer have any records are removed.
+
+    A week whose record versions match its index entry received no new or replaced
+    records, so (with `reuse`) its entry is kept as is: only the weeks a run changed are
+    expanded back to full dicts, serialized and hashed, one partition at a time.
+    Keep-latest keeps the earlier record on a last_modified tie, so the same versions
+    mean the same content.
+
+    Returns the new index, per-run counts of written/unchanged/removed partitions (and how
+    many unchanged ones were reused without serializing them), the bytes written, and the
+    records of every partition ("records": {week: [CompactRecord]}, sorted by recordid).
+    """
+    by_week: dict[str, list[CompactRecord]] = {}
+    for r in records:
+        by_week.setdefault(week_start(r.open_us) or UNKNOWN_WEEK, []).append(r)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index_path = out_dir / INDEX_NAME
+    prev = load_index(index_path)["partitions"]
+
+    partitions: dict[str, dict[str, Any]] = {}
+    written = unchanged = reused = bytes_written = 0
+    for week in sorted(by_week):
+        rows = by_week[week] = sorted(by_week[week], key=lambda r: r.recordid)
+        versions = week_versions(rows)
+        part_path = out_dir / partition_file_name(week)
+        if reuse and prev.get(week, {}).get("versions") == versions and part_path.exists():
+            partitions[week] = prev[week]
+            unchanged += 1
+            reused += 1
+            continue
+        body = json.dumps([r.to_record() for r in rows], indent=2).encode("utf-8")
+        entry = {
+            "file": partition_file_name(week),
+            "rows": len(rows),
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "versions": versions,
+        }
+        if {**prev.get(week, {}), "versions": versions} == entry and part_path.exists():
+            unchanged += 1
+        else:
+            tmp_path = part_path.with_name(part_path.name + ".tmp")
+            tmp_path.write_bytes(body)
+            tmp_path.replace(part_path)
+            written += 1
+            bytes_written += len(body)
+        partitions[week] = entry
+
+    removed = 0
+    for week, entry in prev.items():
+        if week not in partitions:
+            (out_dir / entry["file"]).unlink(missing_ok=True)
+            removed += 1
+
+    index = {"partitions": partitions}
+    tmp_index = index_path.with_name(INDEX_NAME + ".tmp")
+    tmp_index.write_text(json.dumps(index, indent=2), encoding="utf-8")
+    tmp_index.replace(index_path)
+    return {
+        "index": index,
+        "written": written,
+        "unchanged": unchanged,
+        "reused": reused,
+        "removed": removed,
+        "bytes_written": bytes_written,
+        "records": by_week,
+    }
+
+
+def partitions_size(index_path: Path) -> int:
+    """Bytes on disk of every partition file listed in the index."""
+    index = load_index(index_path)
+    return sum(
+        (index_path.parent / entry["file"]).stat().st_size
+        for entry in index["partitions"].values()
+        if (index_path.parent / entry["file"]).exists()
+    )
+
+
+def iter_partition_records(index_path: Path) -> Iterator[dict[str, Any]]:
+    """Stream every record of a partitioned Silver snapshot, week by week."""
+    index = load_index(index_path)
+    for week in sorted(index["partitions"]):
+        yield from iter_records(index_path.parent / index["partitions"][week]["file"])